@@ -1,85 +1,299 @@
 from __future__ import annotations
 
 import concurrent.futures
+import contextlib
 import datetime
 import hashlib
+import itertools
 import os
+import random
 import re
+import stat
 import sys
 import tempfile
 import textwrap
+import threading
 import time
-from functools import wraps
+from collections import defaultdict, deque
+from collections.abc import Iterable, Iterator
+from functools import lru_cache, wraps
 from typing import Any, Callable, TypeVar
 
-from openai import OpenAI
+import httpx
+from openai import APIConnectionError, APIStatusError, OpenAI
 
 T = TypeVar("T")
 
 
-def redact_api_key(text: str) -> str:
-    """Redact API key from error messages to prevent accidental exposure."""
-    api_key = os.getenv("OPENROUTER_API_KEY", "")
-    if api_key and len(api_key) > 8:
+# Provider keys (OpenRouter, Anthropic, OpenAI project keys) and bearer tokens,
+# matched in one pass. Each branch is a prefix plus a single character class
+# with no nested quantifiers, so the scan stays linear; keys are deliberately
+# unbounded so long ones are redacted in full.
+_SECRET_MARKERS = ("sk-or-", "sk-ant-", "sk-proj-", "Bearer")
+_SECRET_RE = re.compile(
+    r"(sk-(?:or|ant|proj)-)[a-zA-Z0-9_-]+|(Bearer\s+)[A-Za-z0-9._~+/-]{20,}=*"
+)
+
+
+def _redact_secret_match(match: re.Match[str]) -> str:
+    """Replace a matched secret, keeping only its prefix for debugging."""
+    return f"{match.group(1) or match.group(2)}...[REDACTED]"
+
+
+@lru_cache(maxsize=256)
+def _redact_text(text: str, api_key: str) -> str:
+    """Redact api_key and known secret patterns from text.
+
+    Cached because retries log the same error message several times; the key
+    is part of the cache key, so a rotated key never hits a stale entry.
+    """
+    if len(api_key) > 8:
         # Redact the full key, showing only first 4 chars for debugging
         redacted = api_key[:4] + "..." + "[REDACTED]"
         text = text.replace(api_key, redacted)
     # Also catch common API key patterns that might appear
 
-    # Redact any sk-or-* pattern (OpenRouter keys)
-    text = re.sub(r"sk-or-[a-zA-Z0-9_-]+", "sk-or-...[REDACTED]", text)
+    # Redact any sk-or-*/sk-ant-*/sk-proj-* key or bearer token; most messages
+    # contain none, so substring checks skip the regex entirely. The full
+    # prefixes matter: the "sk-o...[REDACTED]" left by the exact-key replace
+    # above must not send every message through the regex anyway
+    if any(marker in text for marker in _SECRET_MARKERS):
+        text = _SECRET_RE.sub(_redact_secret_match, text)
     return text
 
 
+def redact_api_key(text: str, api_key: str | None = None) -> str:
+    """Redact API key from error messages to prevent accidental exposure.
+
+    Args:
+        text: Message that may contain an API key
+        api_key: Key to redact; read from OPENROUTER_API_KEY when omitted
+
+    Returns:
+        The message with the key and any provider keys or tokens redacted
+    """
+    if api_key is None:
+        api_key = os.getenv("OPENROUTER_API_KEY", "")
+    return _redact_text(text, api_key)
+
+
+def iter_commit_lines(path: str) -> Iterator[str]:
+    """Yield non-empty lines from a commits file without reading it whole.
+
+    Args:
+        path: Path to a file with one commit per line
+
+    Yields:
+        Each line with its trailing newline removed
+    """
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if line.strip():
+                yield line
+
+
+def iter_process_commits(
+    commits_raw: str | Iterable[str], repo_url: str | None = None
+) -> Iterator[tuple[str, str]]:
+    """Yield the formatted line and markdown link for each commit.
+
+    Args:
+        commits_raw: Raw commit string, or an iterable of commit lines, with
+            format: hash|subject|author|date|short_hash
+        repo_url: GitHub repository URL for commit links
+
+    Yields:
+        Tuple of (formatted_commit, commit_link) per commit
+    """
+    if repo_url is None:
+        repo_url = f"https://github.com/{os.getenv('GITHUB_REPOSITORY', 'unknown')}"
+
+    if isinstance(commits_raw, str):
+        stripped = commits_raw.strip()
+        lines: Iterable[str] = stripped.split("\n") if stripped else []
+    else:
+        # Consumed lazily so streamed input is never held as a second list
+        lines = commits_raw
+    commit_url = f"{repo_url}/commit/"
+
+    for line in lines:
+        # Bounded splits: the hash never contains "|", so split it off the
+        # front and take the last three fields from the back. Any "|" left
+        # over belongs to the subject.
+        full_hash, sep, rest = line.partition("|")
+        parts = rest.rsplit("|", 3) if sep else []
+        if len(parts) == 4:
+            subject, author, date, short_hash = parts
+            yield (
+                f"• {subject} ({author}, {date})",
+                f"- [{short_hash}]({commit_url}{full_hash}) {subject} - {author}",
+            )
+        else:
+            yield f"• {line}", f"- {line}"
+
+
 def process_commits_in_chunks(
-    commits_raw: str, repo_url: str | None = None, chunk_size: int = 50
+    commits_raw: str | Iterable[str], repo_url: str | None = None
 ) -> tuple[list[str], list[str]]:
-    """Process commits in chunks to handle large commit sets efficiently.
+    """Format commits and their links in a single pass.
 
     Args:
-        commits_raw: Raw commit string with format: hash|subject|author|date|short_hash
+        commits_raw: Raw commit string, or an iterable of commit lines, with
+            format: hash|subject|author|date|short_hash
         repo_url: GitHub repository URL for commit links
-        chunk_size: Number of commits to process per chunk
 
     Returns:
         Tuple of (commits_formatted, commit_links)
     """
-    if repo_url is None:
-        repo_url = f"https://github.com/{os.getenv('GITHUB_REPOSITORY', 'unknown')}"
-
-    lines = commits_raw.strip().split("\n") if commits_raw.strip() else []
     local_commits_formatted = []
     local_commit_links = []
+    for formatted, link in iter_process_commits(commits_raw, repo_url):
+        local_commits_formatted.append(formatted)
+        local_commit_links.append(link)
 
-    # Process in smaller chunks to manage memory for very large sets
-    for i in range(0, len(lines), chunk_size):
-        chunk = lines[i : i + chunk_size]
-
-        for line in chunk:
-            if "|" in line:
-                parts = line.split("|")
-                if len(parts) >= 5:
-                    full_hash, subject, author, date, short_hash = parts[:5]
-                    local_commits_formatted.append(f"• {subject} ({author}, {date})")
-                    local_commit_links.append(
-                        f"- [{short_hash}]({repo_url}/commit/{full_hash}) {subject} - {author}"
-                    )
-                else:
-                    local_commits_formatted.append(f"• {line}")
-                    local_commit_links.append(f"- {line}")
-            else:
-                local_commits_formatted.append(f"• {line}")
-                local_commit_links.append(f"- {line}")
-
-        # Progress indicator for very large sets
-        if len(lines) > 200 and i % (chunk_size * 4) == 0:
-            print(
-                f"📊 Processed {min(i + chunk_size, len(lines))}/{len(lines)} commits..."
-            )
+    if len(local_commits_formatted) > 200:
+        print(f"📊 Processed {len(local_commits_formatted)} commits...")
 
     return local_commits_formatted, local_commit_links
 
 
+# Conventional-commit type of a formatted commit line, e.g. "• feat(api)!: ..."
+_COMMIT_TYPE_RE = re.compile(r"^• (\w+)(?:\([^)]*\))?!?:")
+
+
+def summarize_commits_by_type(commits_formatted: list[str], examples: int = 3) -> str:
+    """Condense formatted commits into per-type counts with a few examples.
+
+    Commits are grouped by their conventional-commit prefix (feat, fix,
+    docs, ...); anything without one is grouped as "other".
+
+    Args:
+        commits_formatted: Formatted commit lines ("• subject (author, date)")
+        examples: Number of example commits listed per type
+
+    Returns:
+        One line per commit type, largest group first
+    """
+    groups: defaultdict[str, list[str]] = defaultdict(list)
+    for commit in commits_formatted:
+        match = _COMMIT_TYPE_RE.match(commit)
+        groups[match.group(1).lower() if match else "other"].append(commit)
+
+    lines = []
+    for commit_type, commits in sorted(
+        groups.items(), key=lambda item: (-len(item[1]), item[0])
+    ):
+        sample = "; ".join(commit[2:] for commit in commits[:examples])
+        lines.append(f"[{commit_type}] {len(commits)} commits, e.g.: {sample}")
+    return "\n".join(lines)
+
+
+# strftime date format for the "Generated on" line, per output language
+DATE_FORMATS = {
+    "English": "%m-%d-%Y",
+    "Dutch": "%d-%m-%Y",
+    "German": "%d.%m.%Y",
+    "French": "%d/%m/%Y",
+    "Spanish": "%d/%m/%Y",
+}
+
+
+# Changelog labels and fallback texts per supported output language
+LANGUAGE_CONFIGS: dict[str, dict[str, str]] = {
+    "English": {
+        "week_label": "Week",
+        "generated_on": "Generated on",
+        "commits_label": "commits",
+        "tech_changes": "🔧 Technical Changes",
+        "user_impact": "📈 User Impact",
+        "all_commits": "📋 All Commits",
+        "statistics": "📊 Statistics",
+        "file_changes": "📁 File Changes",
+        "changelog_title": "Changelog",
+        "auto_updated": "This file is automatically updated with weekly changes.",
+        "fallback_tech": "Technical changes were made this week. See commit details below for specifics.",
+        "fallback_business": "Various improvements and updates were implemented this week.",
+        "lines_added": "lines added",
+        "lines_deleted": "lines deleted",
+        "files_changed": "files changed",
+        "force_updated": "(Force Updated)",
+    },
+    "Dutch": {
+        "week_label": "Week",
+        "generated_on": "Gegenereerd op",
+        "commits_label": "commits",
+        "tech_changes": "🔧 Technische wijzigingen",
+        "user_impact": "📈 Impact voor gebruikers",
+        "all_commits": "📋 Alle commits",
+        "statistics": "📊 Statistieken",
+        "file_changes": "📁 Bestandswijzigingen",
+        "changelog_title": "Changelog",
+        "auto_updated": "Dit bestand wordt automatisch bijgewerkt met wekelijkse wijzigingen.",
+        "fallback_tech": "Er zijn deze week technische wijzigingen doorgevoerd. Zie onderstaande commit details.",
+        "fallback_business": "Deze week zijn diverse verbeteringen en updates doorgevoerd.",
+        "lines_added": "regels toegevoegd",
+        "lines_deleted": "regels verwijderd",
+        "files_changed": "bestanden gewijzigd",
+        "force_updated": "(Geforceerd bijgewerkt)",
+    },
+    "German": {
+        "week_label": "Woche",
+        "generated_on": "Generiert am",
+        "commits_label": "Commits",
+        "tech_changes": "🔧 Technische Änderungen",
+        "user_impact": "📈 Benutzerauswirkung",
+        "all_commits": "📋 Alle Commits",
+        "statistics": "📊 Statistiken",
+        "file_changes": "📁 Dateiänderungen",
+        "changelog_title": "Changelog",
+        "auto_updated": "Diese Datei wird automatisch mit wöchentlichen Änderungen aktualisiert.",
+        "fallback_tech": "Diese Woche wurden technische Änderungen vorgenommen. Details siehe unten.",
+        "fallback_business": "Diese Woche wurden verschiedene Verbesserungen und Updates implementiert.",
+        "lines_added": "Zeilen hinzugefügt",
+        "lines_deleted": "Zeilen gelöscht",
+        "files_changed": "Dateien geändert",
+        "force_updated": "(Erzwungen aktualisiert)",
+    },
+    "French": {
+        "week_label": "Semaine",
+        "generated_on": "Généré le",
+        "commits_label": "commits",
+        "tech_changes": "🔧 Modifications techniques",
+        "user_impact": "📈 Impact utilisateur",
+        "all_commits": "📋 Tous les commits",
+        "statistics": "📊 Statistiques",
+        "file_changes": "📁 Changements de fichiers",
+        "changelog_title": "Journal des modifications",
+        "auto_updated": "Ce fichier est automatiquement mis à jour avec les changements hebdomadaires.",
+        "fallback_tech": "Des modifications techniques ont été apportées cette semaine. Voir les détails ci-dessous.",
+        "fallback_business": "Diverses améliorations et mises à jour ont été implémentées cette semaine.",
+        "lines_added": "lignes ajoutées",
+        "lines_deleted": "lignes supprimées",
+        "files_changed": "fichiers modifiés",
+        "force_updated": "(Mise à jour forcée)",
+    },
+    "Spanish": {
+        "week_label": "Semana",
+        "generated_on": "Generado el",
+        "commits_label": "commits",
+        "tech_changes": "🔧 Cambios técnicos",
+        "user_impact": "📈 Impacto del usuario",
+        "all_commits": "📋 Todos los commits",
+        "statistics": "📊 Estadísticas",
+        "file_changes": "📁 Cambios en archivos",
+        "changelog_title": "Registro de cambios",
+        "auto_updated": "Este archivo se actualiza automáticamente con cambios semanales.",
+        "fallback_tech": "Se realizaron cambios técnicos esta semana. Ver detalles de commits abajo.",
+        "fallback_business": "Se implementaron varias mejoras y actualizaciones esta semana.",
+        "lines_added": "líneas agregadas",
+        "lines_deleted": "líneas eliminadas",
+        "files_changed": "archivos cambiados",
+        "force_updated": "(Actualización forzada)",
+    },
+}
+
+
 def get_language_config(language: str) -> dict[str, str]:
     """Get language configuration for changelog generation.
 
@@ -89,268 +303,406 @@ def get_language_config(language: str) -> dict[str, str]:
     Returns:
         Dict with language-specific labels and text
     """
-    language_configs = {
-        "English": {
-            "week_label": "Week",
-            "generated_on": "Generated on",
-            "commits_label": "commits",
-            "tech_changes": "🔧 Technical Changes",
-            "user_impact": "📈 User Impact",
-            "all_commits": "📋 All Commits",
-            "statistics": "📊 Statistics",
-            "file_changes": "📁 File Changes",
-            "changelog_title": "Changelog",
-            "auto_updated": "This file is automatically updated with weekly changes.",
-            "fallback_tech": "Technical changes were made this week. See commit details below for specifics.",
-            "fallback_business": "Various improvements and updates were implemented this week.",
-            "lines_added": "lines added",
-            "lines_deleted": "lines deleted",
-            "files_changed": "files changed",
-            "force_updated": "(Force Updated)",
-        },
-        "Dutch": {
-            "week_label": "Week",
-            "generated_on": "Gegenereerd op",
-            "commits_label": "commits",
-            "tech_changes": "🔧 Technische wijzigingen",
-            "user_impact": "📈 Impact voor gebruikers",
-            "all_commits": "📋 Alle commits",
-            "statistics": "📊 Statistieken",
-            "file_changes": "📁 Bestandswijzigingen",
-            "changelog_title": "Changelog",
-            "auto_updated": "Dit bestand wordt automatisch bijgewerkt met wekelijkse wijzigingen.",
-            "fallback_tech": "Er zijn deze week technische wijzigingen doorgevoerd. Zie onderstaande commit details.",
-            "fallback_business": "Deze week zijn diverse verbeteringen en updates doorgevoerd.",
-            "lines_added": "regels toegevoegd",
-            "lines_deleted": "regels verwijderd",
-            "files_changed": "bestanden gewijzigd",
-            "force_updated": "(Geforceerd bijgewerkt)",
-        },
-        "German": {
-            "week_label": "Woche",
-            "generated_on": "Generiert am",
-            "commits_label": "Commits",
-            "tech_changes": "🔧 Technische Änderungen",
-            "user_impact": "📈 Benutzerauswirkung",
-            "all_commits": "📋 Alle Commits",
-            "statistics": "📊 Statistiken",
-            "file_changes": "📁 Dateiänderungen",
-            "changelog_title": "Changelog",
-            "auto_updated": "Diese Datei wird automatisch mit wöchentlichen Änderungen aktualisiert.",
-            "fallback_tech": "Diese Woche wurden technische Änderungen vorgenommen. Details siehe unten.",
-            "fallback_business": "Diese Woche wurden verschiedene Verbesserungen und Updates implementiert.",
-            "lines_added": "Zeilen hinzugefügt",
-            "lines_deleted": "Zeilen gelöscht",
-            "files_changed": "Dateien geändert",
-            "force_updated": "(Erzwungen aktualisiert)",
-        },
-        "French": {
-            "week_label": "Semaine",
-            "generated_on": "Généré le",
-            "commits_label": "commits",
-            "tech_changes": "🔧 Modifications techniques",
-            "user_impact": "📈 Impact utilisateur",
-            "all_commits": "📋 Tous les commits",
-            "statistics": "📊 Statistiques",
-            "file_changes": "📁 Changements de fichiers",
-            "changelog_title": "Journal des modifications",
-            "auto_updated": "Ce fichier est automatiquement mis à jour avec les changements hebdomadaires.",
-            "fallback_tech": "Des modifications techniques ont été apportées cette semaine. Voir les détails ci-dessous.",
-            "fallback_business": "Diverses améliorations et mises à jour ont été implémentées cette semaine.",
-            "lines_added": "lignes ajoutées",
-            "lines_deleted": "lignes supprimées",
-            "files_changed": "fichiers modifiés",
-            "force_updated": "(Mise à jour forcée)",
-        },
-        "Spanish": {
-            "week_label": "Semana",
-            "generated_on": "Generado el",
-            "commits_label": "commits",
-            "tech_changes": "🔧 Cambios técnicos",
-            "user_impact": "📈 Impacto del usuario",
-            "all_commits": "📋 Todos los commits",
-            "statistics": "📊 Estadísticas",
-            "file_changes": "📁 Cambios en archivos",
-            "changelog_title": "Registro de cambios",
-            "auto_updated": "Este archivo se actualiza automáticamente con cambios semanales.",
-            "fallback_tech": "Se realizaron cambios técnicos esta semana. Ver detalles de commits abajo.",
-            "fallback_business": "Se implementaron varias mejoras y actualizaciones esta semana.",
-            "lines_added": "líneas agregadas",
-            "lines_deleted": "líneas eliminadas",
-            "files_changed": "archivos cambiados",
-            "force_updated": "(Actualización forzada)",
-        },
-    }
-
-    if language not in language_configs:
+    if language not in LANGUAGE_CONFIGS:
         print(
             f"⚠️  Warning: Language '{language}' not supported. Falling back to English."
         )
-        print(f"💡 Supported languages: {', '.join(language_configs.keys())}")
-        return language_configs["English"]
+        print(f"💡 Supported languages: {', '.join(LANGUAGE_CONFIGS.keys())}")
+        return LANGUAGE_CONFIGS["English"]
+
+    return LANGUAGE_CONFIGS[language]
+
+
+# Upper bound for a single retry wait, in seconds
+MAX_BACKOFF_SECONDS = 30
+
+
+def _backoff_wait(base: float, previous: float) -> float:
+    """Return a decorrelated-jitter wait between base and 3x the previous wait.
 
-    return language_configs[language]
+    Retries from concurrent callers spread out instead of hitting the API in
+    lockstep, and no single wait exceeds MAX_BACKOFF_SECONDS.
+    """
+    return min(MAX_BACKOFF_SECONDS, random.uniform(base, previous * 3))
+
+
+# Checked in order against the lowercased error text; the first keyword
+# found decides the class, so earlier classes win when several match
+API_ERROR_KEYWORDS = (
+    ("429", "rate"),
+    ("rate limit", "rate"),
+    ("too many requests", "rate"),
+    ("401", "auth"),
+    ("unauthorized", "auth"),
+    ("invalid api key", "auth"),
+    ("404", "model"),
+    ("model not found", "model"),
+    ("not available", "model"),
+    ("413", "payload"),
+    ("too large", "payload"),
+    ("timeout", "network"),
+    ("connection", "network"),
+    ("network", "network"),
+)
+
+
+def classify_api_error(error_str: str) -> str | None:
+    """Classify a lowercased API error message.
+
+    Args:
+        error_str: Lowercased exception text
+
+    Returns:
+        One of "rate", "auth", "model", "payload" or "network", or None
+    """
+    return next(
+        (kind for keyword, kind in API_ERROR_KEYWORDS if keyword in error_str), None
+    )
+
+
+API_ERROR_STATUS_CODES = {429: "rate", 401: "auth", 404: "model", 413: "payload"}
+
+
+def classify_exception(error: Exception, message: str | None = None) -> str | None:
+    """Classify an API exception, preferring the openai client's typed errors.
+
+    Args:
+        error: Exception raised by the API call
+        message: Text to scan when the type is inconclusive; str(error) by default
+
+    Returns:
+        One of "rate", "auth", "model", "payload" or "network", or None
+    """
+    if isinstance(error, APIStatusError):
+        kind = API_ERROR_STATUS_CODES.get(error.status_code)
+        if kind:
+            return kind
+    elif isinstance(error, APIConnectionError):
+        # Also covers APITimeoutError ("Request timed out.")
+        return "network"
+    if message is None:
+        message = str(error)
+    return classify_api_error(message.lower())
 
 
 def retry_api_call(
-    max_retries: int = 3, delay: int = 2, timeout: int = 30
+    max_retries: int = 3,
+    delay: int = 2,
+    timeout: int = 30,
+    sleeper: Callable[[float], None] | None = None,
 ) -> Callable[[Callable[..., T]], Callable[..., T | None]]:
-    """Decorator to retry API calls with exponential backoff, jitter, and rate limiting handling"""
+    """Decorator to retry API calls with capped jittered backoff and rate limiting handling
 
-    def decorator(func: Callable[..., T]) -> Callable[..., T | None]:
-        @wraps(func)
-        def wrapper(*args: Any, **kwargs: Any) -> T | None:
-            import random
+    Args:
+        max_retries: Total number of attempts
+        delay: Base backoff in seconds
+        timeout: Unused; kept for backwards compatibility
+        sleeper: Function used to wait between attempts; time.sleep by default
+    """
 
+    def decorator(func: Callable[..., T]) -> Callable[..., T | None]:
+        def retry_after_failure(
+            error: Exception, args: tuple[Any, ...], kwargs: dict[str, Any]
+        ) -> T | None:
+            # Resolved per call so a patched time.sleep is honoured
+            sleep = sleeper if sleeper is not None else time.sleep
+            wait_time: float = delay
             for attempt in range(max_retries):
-                try:
-                    return func(*args, **kwargs)
-                except Exception as e:
-                    error_str = str(e).lower()
-
-                    # Handle rate limiting specifically
-                    if (
-                        "429" in error_str
-                        or "rate limit" in error_str
-                        or "too many requests" in error_str
-                    ):
-                        if attempt == max_retries - 1:
-                            print(
-                                f"❌ Rate limit exceeded after {max_retries} attempts."
-                            )
-                            print(
-                                "💡 Suggestion: Try again in a few minutes, or consider using a different model with higher rate limits."
-                            )
-                            raise Exception(
-                                f"Rate limit exceeded: {redact_api_key(str(e))}"
-                            ) from e
-
-                        # Longer wait for rate limiting with jitter
-                        wait_time = delay * (3**attempt) + random.uniform(1, 5)
+                if attempt:
+                    try:
+                        return func(*args, **kwargs)
+                    except Exception as e:
+                        error = e
+
+                # Stringify and redact once; classification scans the redacted
+                # text so characters inside a key can't look like a status code
+                error_text = redact_api_key(str(error))
+                error_kind = classify_exception(error, error_text)
+
+                # Handle rate limiting specifically
+                if error_kind == "rate":
+                    if attempt == max_retries - 1:
+                        print(f"❌ Rate limit exceeded after {max_retries} attempts.")
                         print(
-                            f"⏰ Rate limit hit (attempt {attempt + 1}/{max_retries}). Waiting {wait_time:.1f}s before retry..."
+                            "💡 Suggestion: Try again in a few minutes, or consider using a different model with higher rate limits."
                         )
-                        time.sleep(wait_time)
-                        continue
+                        raise Exception(f"Rate limit exceeded: {error_text}") from error
 
-                    # Handle authentication errors
-                    if (
-                        "401" in error_str
-                        or "unauthorized" in error_str
-                        or "invalid api key" in error_str
-                    ):
-                        print(f"❌ Authentication failed: {redact_api_key(str(e))}")
-                        print(
-                            "💡 Please check your OPENROUTER_API_KEY secret is correctly set."
-                        )
-                        print("💡 Verify your API key at: https://openrouter.ai/keys")
-                        raise Exception(
-                            f"Authentication error: {redact_api_key(str(e))}"
-                        ) from e
+                    # Longer wait for rate limiting with jitter
+                    wait_time = _backoff_wait(delay * 2, wait_time)
+                    print(
+                        f"⏰ Rate limit hit (attempt {attempt + 1}/{max_retries}). Waiting {wait_time:.1f}s before retry..."
+                    )
+                    sleep(wait_time)
+                    continue
 
-                    # Handle model not found errors
-                    if (
-                        "404" in error_str
-                        or "model not found" in error_str
-                        or "not available" in error_str
-                    ):
-                        print(f"❌ Model error: {redact_api_key(str(e))}")
-                        print(
-                            f"💡 The model '{os.getenv('MODEL', 'openai/gpt-5-mini')}' may not be available."
-                        )
-                        print(
-                            "💡 Check available models at: https://openrouter.ai/models"
-                        )
-                        print(
-                            "💡 Consider using 'openai/gpt-5-mini' or 'anthropic/claude-3-haiku' as alternatives."
-                        )
-                        raise Exception(
-                            f"Model availability error: {redact_api_key(str(e))}"
-                        ) from e
+                # Handle authentication errors
+                if error_kind == "auth":
+                    print(f"❌ Authentication failed: {error_text}")
+                    print(
+                        "💡 Please check your OPENROUTER_API_KEY secret is correctly set."
+                    )
+                    print("💡 Verify your API key at: https://openrouter.ai/keys")
+                    raise Exception(f"Authentication error: {error_text}") from error
 
-                    # Handle payload too large errors
-                    if (
-                        "413" in error_str
-                        or "too large" in error_str
-                        or "entity too large" in error_str
-                    ):
-                        print(f"❌ Request payload too large: {redact_api_key(str(e))}")
-                        print(
-                            "💡 The merge payload exceeds API limits. Hierarchical merge will be attempted."
-                        )
-                        raise Exception(
-                            f"Payload too large error: {redact_api_key(str(e))}"
-                        ) from e
+                # Handle model not found errors
+                if error_kind == "model":
+                    print(f"❌ Model error: {error_text}")
+                    print(
+                        f"💡 The model '{os.getenv('MODEL', 'openai/gpt-5-mini')}' may not be available."
+                    )
+                    print("💡 Check available models at: https://openrouter.ai/models")
+                    print(
+                        "💡 Consider using 'openai/gpt-5-mini' or 'anthropic/claude-3-haiku' as alternatives."
+                    )
+                    raise Exception(
+                        f"Model availability error: {error_text}"
+                    ) from error
 
-                    # Handle network errors
-                    if (
-                        "timeout" in error_str
-                        or "connection" in error_str
-                        or "network" in error_str
-                    ):
-                        if attempt == max_retries - 1:
-                            print(
-                                f"❌ Network connectivity issues persisted after {max_retries} attempts."
-                            )
-                            print(
-                                "💡 Check your internet connection and GitHub Actions network status."
-                            )
-                            raise Exception(
-                                f"Network error: {redact_api_key(str(e))}"
-                            ) from e
+                # Handle payload too large errors
+                if error_kind == "payload":
+                    print(f"❌ Request payload too large: {error_text}")
+                    print(
+                        "💡 The merge payload exceeds API limits. Hierarchical merge will be attempted."
+                    )
+                    raise Exception(f"Payload too large error: {error_text}") from error
 
-                        wait_time = delay * (2**attempt) + random.uniform(0.5, 2)
+                # Handle network errors
+                if error_kind == "network":
+                    if attempt == max_retries - 1:
                         print(
-                            f"🔌 Network issue (attempt {attempt + 1}/{max_retries}): {redact_api_key(str(e))}"
+                            f"❌ Network connectivity issues persisted after {max_retries} attempts."
                         )
-                        print(f"🔄 Retrying in {wait_time:.1f}s...")
-                        time.sleep(wait_time)
-                        continue
-
-                    # Generic error handling
-                    if attempt == max_retries - 1:
-                        print(f"❌ Final attempt failed: {redact_api_key(str(e))}")
                         print(
-                            "💡 If this persists, check the action logs and consider:"
+                            "💡 Check your internet connection and GitHub Actions network status."
                         )
-                        print("   - Reducing the days_back parameter")
-                        print("   - Using a different model")
-                        print("   - Checking OpenRouter service status")
-                        raise
+                        raise Exception(f"Network error: {error_text}") from error
 
-                    # Exponential backoff with jitter for other errors
-                    wait_time = delay * (2**attempt) + random.uniform(0.1, 1)
+                    wait_time = _backoff_wait(delay, wait_time)
                     print(
-                        f"⚠️  API call failed (attempt {attempt + 1}/{max_retries}): {redact_api_key(str(e))}"
+                        f"🔌 Network issue (attempt {attempt + 1}/{max_retries}): {error_text}"
                     )
                     print(f"🔄 Retrying in {wait_time:.1f}s...")
-                    time.sleep(wait_time)
+                    sleep(wait_time)
+                    continue
+
+                # Generic error handling
+                if attempt == max_retries - 1:
+                    print(f"❌ Final attempt failed: {error_text}")
+                    print("💡 If this persists, check the action logs and consider:")
+                    print("   - Reducing the days_back parameter")
+                    print("   - Using a different model")
+                    print("   - Checking OpenRouter service status")
+                    raise error
+
+                # Jittered backoff for other errors
+                wait_time = _backoff_wait(delay, wait_time)
+                print(
+                    f"⚠️  API call failed (attempt {attempt + 1}/{max_retries}): {error_text}"
+                )
+                print(f"🔄 Retrying in {wait_time:.1f}s...")
+                sleep(wait_time)
             return None
 
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> T | None:
+            # Most calls succeed first time; keep that path to a single try
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                error = e
+            return retry_after_failure(error, args, kwargs)
+
         return wrapper
 
     return decorator
 
 
+# OpenRouter allows 20 requests per minute on free model variants
+FREE_MODEL_RPM_LIMIT = 20
+
+_request_times: deque[float] = deque()
+_request_times_lock = threading.Lock()
+
+
+def get_rpm_limit(model: str) -> int:
+    """Resolve the requests-per-minute budget for API calls.
+
+    Args:
+        model: OpenRouter model name
+
+    Returns:
+        OPENROUTER_RPM if set, the free-tier limit for ":free" models,
+        otherwise 0 (no client-side limit)
+    """
+    rpm_env = os.getenv("OPENROUTER_RPM", "").strip()
+    if rpm_env:
+        try:
+            return max(0, int(rpm_env))
+        except ValueError:
+            print(f"⚠️  Warning: Ignoring invalid OPENROUTER_RPM value: {rpm_env}")
+    return FREE_MODEL_RPM_LIMIT if model.endswith(":free") else 0
+
+
+def wait_for_rate_limit(rpm_limit: int) -> None:
+    """Block until another request fits in the sliding one-minute window.
+
+    Shared by all worker threads, so concurrent chunks queue locally instead
+    of spending a round trip on a 429 response.
+
+    Args:
+        rpm_limit: Maximum requests per 60 seconds; 0 disables the limit
+    """
+    if rpm_limit <= 0:
+        return
+
+    while True:
+        with _request_times_lock:
+            now = time.monotonic()
+            while _request_times and now - _request_times[0] >= 60:
+                _request_times.popleft()
+            if len(_request_times) < rpm_limit:
+                _request_times.append(now)
+                return
+            wait = 60 - (now - _request_times[0])
+        time.sleep(wait)
+
+
+# Intermediate files written by the commit collection step of action.yml
+TEMP_FILES = (
+    "commits.txt",
+    "commits_extended.txt",
+    "files_changed.txt",
+    "lines_added.tmp",
+    "lines_deleted.tmp",
+)
+
+
 def cleanup_temp_files() -> None:
     """Clean up temporary files to free memory"""
-    temp_files = [
-        "commits.txt",
-        "commits_extended.txt",
-        "files_changed.txt",
-        "lines_added.tmp",
-        "lines_deleted.tmp",
-    ]
-    for temp_file in temp_files:
+    for temp_file in TEMP_FILES:
         try:
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
+            os.remove(temp_file)
+        except FileNotFoundError:
+            pass
         except OSError as e:
             print(f"Warning: Could not remove temp file {temp_file}: {e}")
 
 
+# Characters of CHANGELOG.md loaded into memory; the rest is streamed on write
+CHANGELOG_HEAD_CHARS = 65536
+
+# First weekly section header ("## Week ..."); new entries are inserted above it
+_ENTRY_HEADER_RE = re.compile(r"^## ", re.MULTILINE)
+
+
+def find_entry_insert_offset(content: str) -> int:
+    """Find where a new weekly entry should be inserted into a changelog.
+
+    Entries are newest-first, so the insertion point is the first ``## ``
+    header. It sits just below the title and description, so the search
+    stops within the first few hundred characters of the file.
+
+    Args:
+        content: Existing changelog content
+
+    Returns:
+        Offset of the first ``## `` header, or len(content) if there is none
+    """
+    match = _ENTRY_HEADER_RE.search(content)
+    return match.start() if match else len(content)
+
+
+def has_changelog_section(content: str, header: str) -> bool:
+    """Check whether a changelog already has an entry with the given header.
+
+    The header only counts at the start of a line, so a ``###`` heading or a
+    header quoted in entry text is not mistaken for an entry.
+
+    Args:
+        content: Existing changelog content
+        header: Entry header to look for, e.g. "## Week 3, 2025"
+
+    Returns:
+        True if an entry header line starts with ``header``
+    """
+    return re.search(rf"^{re.escape(header)}(?!\d)", content, re.MULTILINE) is not None
+
+
+def remove_changelog_section(content: str, header: str) -> str:
+    """Remove every entry whose header line starts with ``header``.
+
+    An entry runs from its header line, matched as in has_changelog_section(),
+    up to the next ``## `` header, which is kept, or up to and including a
+    ``---`` separator line.
+
+    Args:
+        content: Existing changelog content
+        header: Entry header to remove, e.g. "## Week 3, 2025"
+
+    Returns:
+        Changelog content without the matching entries
+    """
+    pattern = re.compile(
+        rf"^{re.escape(header)}(?!\d)[^\n]*(?:\n|\Z).*?(?:^---[^\n]*(?:\n|\Z)|(?=^## )|\Z)",
+        re.MULTILINE | re.DOTALL,
+    )
+    return pattern.sub("", content)
+
+
+def iter_file_text(path: str, offset: int, chunk_size: int = 65536) -> Iterator[str]:
+    """Yield a text file's content from a tell() offset in fixed-size chunks.
+
+    Args:
+        path: File to read
+        offset: Position previously returned by tell() on the same file
+        chunk_size: Number of characters per yielded chunk
+
+    Yields:
+        Consecutive chunks of the remaining file content
+    """
+    with open(path, encoding="utf-8") as f:
+        f.seek(offset)
+        yield from iter(lambda: f.read(chunk_size), "")
+
+
+def write_text_atomic(path: str, parts: Iterable[str]) -> None:
+    """Write text fragments to a file atomically.
+
+    Fragments are streamed into a temporary file in the destination directory,
+    which then replaces the target via os.replace(). Readers never observe a
+    partially written file, and the full content is never joined in memory.
+
+    Args:
+        path: Destination file path
+        parts: Text fragments written in order
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            for part in parts:
+                f.write(part)
+        # mkstemp creates the file as 0600; keep the target's existing mode
+        try:
+            os.chmod(tmp_path, stat.S_IMODE(os.stat(path).st_mode))
+        except FileNotFoundError:
+            os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+
+
 def get_chunk_cache_key(
-    chunk_commits_text: str, summary_type: str, model: str, output_language: str
+    chunk_commits_text: str,
+    summary_type: str,
+    model: str,
+    output_language: str,
+    extended_analysis: bool = False,
 ) -> str:
     """Generate deterministic cache key for chunk summaries.
 
@@ -359,17 +711,23 @@ def get_chunk_cache_key(
         summary_type: "technical" or "business"
         model: Model name used for generation
         output_language: Language for output
+        extended_analysis: Whether extended file data was part of the prompt
 
     Returns:
         16-character hex string cache key
     """
     content = f"{chunk_commits_text}|{summary_type}|{model}|{output_language}"
+    if extended_analysis:
+        content += "|extended"
     return hashlib.sha256(content.encode()).hexdigest()[:16]
 
 
+@lru_cache(maxsize=1)
 def get_chunk_cache_dir() -> str:
     """Get chunk cache directory path and ensure it exists.
 
+    Resolved once per process; every chunk read and write reuses the path.
+
     Returns:
         Path to chunk cache directory
     """
@@ -378,6 +736,15 @@ def get_chunk_cache_dir() -> str:
     return cache_dir
 
 
+def cache_disabled() -> bool:
+    """Check whether cached summaries should be ignored for this run.
+
+    Returns:
+        True if CACHE_DISABLE is set to a truthy value
+    """
+    return os.getenv("CACHE_DISABLE", "").lower() in ("1", "true", "yes")
+
+
 def read_chunk_cache(cache_key: str) -> str | None:
     """Read cached chunk summary from disk.
 
@@ -385,20 +752,25 @@ def read_chunk_cache(cache_key: str) -> str | None:
         cache_key: Cache key for the chunk
 
     Returns:
-        Cached content or None if not found/empty
+        Cached content or None if not found/empty or caching is disabled
     """
+    if cache_disabled():
+        return None
+
     cache_dir = get_chunk_cache_dir()
     cache_file = os.path.join(cache_dir, f"{cache_key}.txt")
 
     try:
-        if os.path.exists(cache_file):
-            with open(cache_file, encoding="utf-8") as f:
-                content = f.read().strip()
-                return content if content else None
+        # Raw bytes decoded once; a missing file is an ordinary cache miss
+        with open(cache_file, "rb") as f:
+            content = f.read().decode("utf-8").strip()
+    except FileNotFoundError:
+        return None
     except (OSError, UnicodeDecodeError) as e:
         print(f"⚠️  Warning: Could not read cache file {cache_key}: {e}")
+        return None
 
-    return None
+    return content if content else None
 
 
 def write_chunk_cache(cache_key: str, content: str) -> None:
@@ -412,13 +784,13 @@ def write_chunk_cache(cache_key: str, content: str) -> None:
     cache_file = os.path.join(cache_dir, f"{cache_key}.txt")
 
     try:
-        with open(cache_file, "w", encoding="utf-8") as f:
-            f.write(content)
+        # Atomic so an interrupted run never leaves a truncated cache hit
+        write_text_atomic(cache_file, [content])
     except OSError as e:
         print(f"⚠️  Warning: Could not write cache file {cache_key}: {e}")
 
 
-def cleanup_chunk_cache(max_age_hours: int = 48) -> None:
+def cleanup_chunk_cache(max_age_hours: int = 168) -> None:
     """Remove stale chunk cache files older than max_age_hours.
 
     Args:
@@ -430,26 +802,191 @@ def cleanup_chunk_cache(max_age_hours: int = 48) -> None:
     removed_count = 0
 
     try:
-        for filename in os.listdir(cache_dir):
-            if filename.endswith(".txt"):
-                file_path = os.path.join(cache_dir, filename)
+        # One directory scan; DirEntry gives the file type without a stat call
+        with os.scandir(cache_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".txt") or not entry.is_file():
+                    continue
                 try:
-                    file_age = current_time - os.path.getmtime(file_path)
-                    if file_age > max_age_seconds:
-                        os.remove(file_path)
+                    if current_time - entry.stat().st_mtime > max_age_seconds:
+                        os.remove(entry.path)
                         removed_count += 1
                 except OSError:
                     pass  # Skip files we can't access
     except OSError:
         pass  # Directory doesn't exist or can't be read
 
-    if removed_count > 0:
-        print(f"🧹 Cleaned up {removed_count} stale chunk cache files")
+    if removed_count > 0:
+        print(f"🧹 Cleaned up {removed_count} stale chunk cache files")
+
+
+# Dedented once at import; the runtime values are filled in with str.format()
+MERGE_PROMPT_TEMPLATE = textwrap.dedent("""
+    You are merging multiple changelog summaries into a single cohesive summary.
+
+    You have {num_chunks} summaries covering {total_commits} total commits.
+
+    Here are the individual chunk summaries:
+
+    {combined_chunks}
+
+    Your task: Create ONE unified, well-structured summary that:
+    1. Combines all information from the chunks
+    2. Removes duplicates and redundant information
+    3. Organizes content logically by category
+    4. Maintains proper markdown formatting with headers and bullets
+    5. Is comprehensive and covers all significant changes
+    6. Flows naturally as a single document
+
+    Ensure output starts directly with content (no ### level headers). Use #### for sub-sections.
+    Use the same structure and formatting as the individual chunks.
+    Language: {output_language}
+
+    Generate the merged {summary_type}:
+    """).strip()
+
+
+# Summary prompt templates are written at column zero and filled in with
+# str.format(), so they need no dedent at runtime. Concise prompts for small
+# commit sets avoid empty category filler.
+TECH_PROMPT_CONCISE = """
+You are a senior software developer writing a technical changelog for a development team.
+
+Analyze these commits and create a concise technical summary in {output_language}:
+
+{base_context}
+
+Create a structured technical summary. Start directly with content (no top-level ### header).
+
+Write a 1-2 sentence overview of the changes, then list each change as a bullet point with specific details about what was changed and why. Use #### headers only if there are multiple distinct categories of changes. Skip categories with no relevant changes.
+
+Requirements:
+- Start directly with the overview text (no ### header)
+- Use #### for sub-sections only when needed
+- Use bullet lists (-) for all items
+- Be concise — only include relevant categories
+- Provide specific details about what was changed and why
+{extended_focus}
+
+Write in a clear, structured format with proper markdown formatting.
+""".strip()
+
+BUSINESS_PROMPT_CONCISE = """
+You are a product manager communicating updates to stakeholders and end users.
+
+Translate these technical commits into business impact in {output_language}:
+
+{base_context}
+
+Create a business-focused summary. Start directly with content (no top-level ### header).
+
+Write a 2-3 sentence overview for a non-technical audience, then list key impacts as bullet points. Only include sections that are relevant to the actual changes. Skip sections with no relevant impact.
+
+Requirements:
+- Start directly with the overview text (no ### header)
+- Use #### for sub-sections only when needed
+- Use bullet lists (-) for all items
+- Avoid technical jargon and implementation details
+- Focus on benefits, outcomes, and user value
+- Be concise — only include relevant sections
+{extended_scope}
+
+Write in a clear, business-focused style with proper markdown formatting.
+""".strip()
+
+# Full prompts for larger commit sets
+TECH_PROMPT_FULL = """
+You are a senior software developer writing a technical changelog for a development team.
+
+Analyze these commits and create a structured technical summary in {output_language}:
+
+{base_context}
+
+Create a structured technical summary. Start directly with content (no top-level ### header):
+
+[Write 1-2 sentence overview of the week's development activity]
+
+#### Main Changes by Category
+
+**Features:**
+- [List each new feature added as a bullet point]
+- [Be specific about what functionality was added]
+
+**Bug Fixes:**
+- [List each bug fix as a bullet point]
+- [Mention what issue was resolved]
+
+**Refactoring:**
+- [List code improvements and restructuring]
+- [Explain what was cleaned up or optimized]
+
+**Infrastructure/DevOps:**
+- [List build, deployment, and tooling changes]
+
+**Documentation:**
+- [List documentation updates]
+
+**Testing:**
+- [List test additions and improvements]
+
+#### Technical Highlights
+- [Key architectural decisions made]
+- [Performance improvements implemented]
+- [Security enhancements added]
+
+Requirements:
+- Start directly with the overview text (no ### header)
+- Use #### for sub-sections
+- Use bold text (**text:**) for category labels
+- Use bullet lists (-) for all items
+- Skip categories with no relevant changes
+- Provide specific details about what was changed and why
+{extended_focus}
+
+Write in a clear, structured format with proper markdown formatting.
+""".strip()
+
+BUSINESS_PROMPT_FULL = """
+You are a product manager communicating updates to stakeholders and end users.
+
+Translate these technical commits into business impact in {output_language}:
+
+{base_context}
+
+Create a business-focused summary. Start directly with content (no top-level ### header):
+
+[Write 2-3 sentence overview for non-technical audience explaining what was accomplished this week]
+
+#### User Experience Impact
+- [How these changes affect what users see and experience]
+
+#### Business Benefits
+- [Value delivered to the organization]
+
+#### Performance & Reliability
+- [Improvements in system speed or responsiveness]
+
+#### New Capabilities
+- [New features or functionality now available]
+
+#### Important Changes to Note
+- [Breaking changes or significant updates users should be aware of]
+
+Requirements:
+- Start directly with the overview text (no ### header)
+- Use #### for sub-sections
+- Use bullet lists (-) for all items
+- Skip sections with no relevant changes
+- Avoid technical jargon and implementation details
+- Focus on benefits, outcomes, and user value
+{extended_scope}
 
+Write in a clear, business-focused style with proper markdown formatting.
+""".strip()
 
 if __name__ == "__main__":
     # Clean up old chunk cache files at startup
-    cleanup_chunk_cache(max_age_hours=48)
+    cleanup_chunk_cache()
 
     # Check if API key is present with detailed guidance
     api_key = os.getenv("OPENROUTER_API_KEY")
@@ -474,18 +1011,45 @@ if __name__ == "__main__":
             "💡 If you're getting authentication errors, verify your key at: https://openrouter.ai/keys"
         )
 
-    # Configure OpenAI client for OpenRouter with timeout
+    # One pooled HTTP client shared by all concurrent chunk workers, sized for
+    # 2 summary types x MAX_CONCURRENT_CHUNKS in-flight requests. Idle
+    # connections outlive the longest retry backoff, so retries reuse the
+    # existing TLS session instead of handshaking again.
+    http_client = httpx.Client(
+        limits=httpx.Limits(
+            max_connections=10,
+            max_keepalive_connections=10,
+            keepalive_expiry=MAX_BACKOFF_SECONDS + 5,
+        ),
+        timeout=30.0,
+    )
+
+    github_repo = os.getenv("GITHUB_REPOSITORY", "unknown")
+    repo_url = f"https://github.com/{github_repo}"
+
+    # Configure OpenAI client for OpenRouter with timeout; the attribution
+    # headers are identical for every request, so they are set once here
     client = OpenAI(
-        api_key=api_key, base_url="https://openrouter.ai/api/v1", timeout=30.0
+        api_key=api_key,
+        base_url="https://openrouter.ai/api/v1",
+        timeout=30.0,
+        http_client=http_client,
+        default_headers={
+            "HTTP-Referer": repo_url,
+            "X-Title": "Weekly-Changelog-Generator",
+        },
     )
 
     model = os.getenv("MODEL", "openai/gpt-5-mini")
+    rpm_limit = get_rpm_limit(model)
     output_language = os.getenv("OUTPUT_LANGUAGE", "English")
     force_update = os.getenv("FORCE_UPDATE", "false").lower() == "true"
     extended_analysis = os.getenv("EXTENDED_ANALYSIS", "false").lower() == "true"
     dry_run = os.getenv("DRY_RUN", "false").lower() == "true"
 
     print(f"🤖 Using model: {model}")
+    if rpm_limit:
+        print(f"🚦 Rate limit: {rpm_limit} requests/minute")
     print(f"🌍 Output language: {output_language}")
     print(f"🔧 Force update: {force_update}")
     print(f"🧪 Dry run mode: {dry_run}")
@@ -494,46 +1058,103 @@ if __name__ == "__main__":
     # Get language-specific configuration
     config = get_language_config(output_language)
 
-    # Read commits
+    # Read commits line by line (avoids holding the raw file and its split copy)
     try:
-        with open("commits.txt", encoding="utf-8") as f:
-            commits_raw = f.read().strip()
+        commit_lines = list(iter_commit_lines("commits.txt"))
     except FileNotFoundError:
         print("❌ commits.txt not found")
         sys.exit(1)
 
-    if not commits_raw:
+    if not commit_lines:
         print("ℹ️  No commits to process")
         sys.exit(0)
 
+    # Calculate week and year
+    today = datetime.date.today()
+    week_num = today.isocalendar()[1]
+    year = today.year
+
+    # Format date according to language
+    date_format = DATE_FORMATS.get(output_language, DATE_FORMATS["English"])
+    formatted_date = today.strftime(date_format)
+
+    # Check for duplicate entries and handle force mode before any API calls,
+    # so re-runs for a week that already has an entry cost nothing
+    changelog_path = "CHANGELOG.md"
+    week_header = f"## {config['week_label']} {week_num}, {year}"
+    force_suffix = f" {config['force_updated']}" if force_update else ""
+
+    try:
+        # Position of changelog content that is streamed, not loaded, on write
+        tail_offset: int | None = None
+
+        if os.path.exists(changelog_path):
+            with open(changelog_path, encoding="utf-8") as f:
+                # The current week's entry is always the newest one at the top,
+                # so large changelogs only need their head loaded into memory
+                existing_content = f.read(CHANGELOG_HEAD_CHARS)
+                head_end = f.tell()
+                if f.read(1):
+                    # Duplicate/force handling and a head without any entry
+                    # header need the whole file; otherwise stream the rest
+                    head_has_entry = find_entry_insert_offset(existing_content) < len(
+                        existing_content
+                    )
+                    if (
+                        has_changelog_section(existing_content, week_header)
+                        or not head_has_entry
+                    ):
+                        f.seek(head_end)
+                        existing_content += f.read()
+                    else:
+                        tail_offset = head_end
+
+            entry_exists = has_changelog_section(existing_content, week_header)
+            if entry_exists and not force_update:
+                print(
+                    f"⚠️  Entry for {config['week_label']} {week_num}, {year} already exists. Use force=true to update anyway."
+                )
+                cleanup_temp_files()
+                sys.exit(0)
+            elif entry_exists and force_update:
+                print(
+                    f"🔧 Force mode: Updating existing entry for {config['week_label']} {week_num}, {year}"
+                )
+                # Remove existing entry
+                existing_content = remove_changelog_section(
+                    existing_content, week_header
+                )
+        else:
+            existing_content = (
+                f"# {config['changelog_title']}\n\n{config['auto_updated']}\n"
+            )
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"❌ Error reading changelog: {e}")
+        cleanup_temp_files()
+        sys.exit(1)
+
     # Read extended data if available
     extended_data = ""
     file_changes_data = ""
 
     if extended_analysis:
         try:
-            # Read detailed commit info
-            if os.path.exists("commits_extended.txt"):
+            # Read detailed commit info; missing files are simply skipped
+            with contextlib.suppress(FileNotFoundError):
                 with open("commits_extended.txt", encoding="utf-8") as f:
                     extended_data = f.read().strip()
 
             # Read file changes
-            if os.path.exists("files_changed.txt"):
+            with contextlib.suppress(FileNotFoundError):
                 with open("files_changed.txt", encoding="utf-8") as f:
-                    files_list = f.read().strip().split("\n")
-                    # Group files by type/directory
-                    file_groups: dict[str, list[str]] = {}
-                    for file_path in files_list:
+                    # Group files by type/directory, streaming one path at a time
+                    file_groups: defaultdict[str, list[str]] = defaultdict(list)
+                    for file_path in f:
+                        file_path = file_path.rstrip("\n")
                         if file_path:
-                            # Get file extension or directory
-                            if "." in file_path:
-                                ext = file_path.split(".")[-1].lower()
-                                key = f"*.{ext} files"
-                            else:
-                                key = "Config/Other files"
-
-                            if key not in file_groups:
-                                file_groups[key] = []
+                            # Group by extension of the file name (not the directory)
+                            ext = os.path.splitext(file_path)[1].lower()
+                            key = f"*{ext} files" if ext else "Config/Other files"
                             file_groups[key].append(file_path)
 
                     file_changes_summary = []
@@ -565,29 +1186,13 @@ if __name__ == "__main__":
             [f"Chunk {i + 1}:\n{summary}" for i, summary in enumerate(chunk_summaries)]
         )
 
-        merge_prompt = textwrap.dedent(f"""
-    You are merging multiple changelog summaries into a single cohesive summary.
-
-    You have {num_chunks} summaries covering {total_commits} total commits.
-
-    Here are the individual chunk summaries:
-
-    {combined_chunks}
-
-    Your task: Create ONE unified, well-structured summary that:
-    1. Combines all information from the chunks
-    2. Removes duplicates and redundant information
-    3. Organizes content logically by category
-    4. Maintains proper markdown formatting with headers and bullets
-    5. Is comprehensive and covers all significant changes
-    6. Flows naturally as a single document
-
-    Ensure output starts directly with content (no ### level headers). Use #### for sub-sections.
-    Use the same structure and formatting as the individual chunks.
-    Language: {output_language}
-
-    Generate the merged {summary_type}:
-    """).strip()
+        merge_prompt = MERGE_PROMPT_TEMPLATE.format(
+            num_chunks=num_chunks,
+            total_commits=total_commits,
+            combined_chunks=combined_chunks,
+            output_language=output_language,
+            summary_type=summary_type,
+        )
 
         # Check prompt size and truncate if needed (safety net for 413 errors)
         MAX_MERGE_PROMPT_CHARS = 100000  # ~25K tokens, safe limit for most models
@@ -611,6 +1216,7 @@ if __name__ == "__main__":
             print(f"⚠️  Warning: Large merge payload (~{estimated_tokens} tokens)")
 
         # Use higher token limit for merging
+        wait_for_rate_limit(rpm_limit)
         response = client.chat.completions.create(
             model=model,
             messages=[
@@ -622,10 +1228,6 @@ if __name__ == "__main__":
             ],
             max_tokens=6000,  # Higher limit for merged output
             temperature=0.3,
-            extra_headers={
-                "HTTP-Referer": f"https://github.com/{os.getenv('GITHUB_REPOSITORY', 'unknown')}",
-                "X-Title": "Weekly-Changelog-Generator",
-            },
         )
 
         content = response.choices[0].message.content
@@ -712,8 +1314,7 @@ if __name__ == "__main__":
         )
 
     # Process commits with chunking for large sets
-    repo_url = f"https://github.com/{os.getenv('GITHUB_REPOSITORY', 'unknown')}"
-    commits_formatted, commit_links = process_commits_in_chunks(commits_raw, repo_url)
+    commits_formatted, commit_links = process_commits_in_chunks(commit_lines, repo_url)
     total_commits = len(commits_formatted)
 
     # Commit count validation and diagnostics
@@ -735,18 +1336,34 @@ if __name__ == "__main__":
             print("   - Actual low activity period")
             print("   - Git filters may be too aggressive")
 
+    # Cap the commits sent to the AI model (git log lists newest first, so the
+    # most recent ones are kept). Older commits are only sent as a compact
+    # per-type overview. The "All Commits" section still lists every commit;
+    # this only bounds prompt tokens and the number of chunk API calls.
+    MAX_PROMPT_COMMITS = 200
+    prompt_commits = commits_formatted[:MAX_PROMPT_COMMITS]
+    analyzed_commits = len(prompt_commits)
+    older_overview = ""
+    if analyzed_commits < total_commits:
+        older_overview = summarize_commits_by_type(
+            commits_formatted[MAX_PROMPT_COMMITS:]
+        )
+        print(
+            f"⚠️  {total_commits} commits found - analyzing the {analyzed_commits} most recent with AI, older ones as an overview by type (all commits are still listed)"
+        )
+
     # Intelligent chunking system for large commit sets
     COMMITS_PER_CHUNK = 5  # Small chunks for highly detailed analysis
     # Limit concurrent chunk processing to avoid rate limiting
     # Higher = faster but more likely to hit 429 errors; Lower = slower but more reliable
     MAX_CONCURRENT_CHUNKS = 3
-    use_chunking = total_commits > COMMITS_PER_CHUNK
+    use_chunking = analyzed_commits > COMMITS_PER_CHUNK
     num_chunks = 0
     chunks_info = ""
 
     if use_chunking:
         num_chunks = (
-            total_commits + COMMITS_PER_CHUNK - 1
+            analyzed_commits + COMMITS_PER_CHUNK - 1
         ) // COMMITS_PER_CHUNK  # Ceiling division
         print(f"📊 Large commit set detected ({total_commits} commits)")
         print(
@@ -755,12 +1372,12 @@ if __name__ == "__main__":
         print(
             "💡 This approach ensures each commit gets focused attention before merging into comprehensive summary"
         )
-        chunks_info = f"\n\n> 📊 **Note**: This changelog was generated by analyzing {total_commits} commits across {num_chunks} detailed chunks for comprehensive, high-quality coverage."
+        chunks_info = f"\n\n> 📊 **Note**: This changelog was generated by analyzing {analyzed_commits} commits across {num_chunks} detailed chunks for comprehensive, high-quality coverage."
+        if older_overview:
+            chunks_info += f" The {total_commits - analyzed_commits} older commits were summarized by type."
     else:
         print(f"✅ Processing all {total_commits} commits in a single analysis")
 
-    commits_links_text = "\n".join(commit_links)
-
     # Build base context for extended analysis (used in all chunks)
     extended_context = ""
     if extended_analysis and extended_data:
@@ -788,144 +1405,18 @@ if __name__ == "__main__":
         if extended_analysis
         else ""
     )
+    prompt_fields = {
+        "output_language": output_language,
+        "extended_focus": extended_focus,
+        "extended_scope": extended_scope,
+    }
 
     if total_commits <= 5:
-        # Concise prompts for small commit sets — no empty category filler
-        tech_prompt_template = textwrap.dedent(f"""
-You are a senior software developer writing a technical changelog for a development team.
-
-Analyze these commits and create a concise technical summary in {output_language}:
-
-{{base_context}}
-
-Create a structured technical summary. Start directly with content (no top-level ### header).
-
-Write a 1-2 sentence overview of the changes, then list each change as a bullet point with specific details about what was changed and why. Use #### headers only if there are multiple distinct categories of changes. Skip categories with no relevant changes.
-
-Requirements:
-- Start directly with the overview text (no ### header)
-- Use #### for sub-sections only when needed
-- Use bullet lists (-) for all items
-- Be concise — only include relevant categories
-- Provide specific details about what was changed and why
-{extended_focus}
-
-Write in a clear, structured format with proper markdown formatting.
-""").strip()
-
-        business_prompt_template = textwrap.dedent(f"""
-You are a product manager communicating updates to stakeholders and end users.
-
-Translate these technical commits into business impact in {output_language}:
-
-{{base_context}}
-
-Create a business-focused summary. Start directly with content (no top-level ### header).
-
-Write a 2-3 sentence overview for a non-technical audience, then list key impacts as bullet points. Only include sections that are relevant to the actual changes. Skip sections with no relevant impact.
-
-Requirements:
-- Start directly with the overview text (no ### header)
-- Use #### for sub-sections only when needed
-- Use bullet lists (-) for all items
-- Avoid technical jargon and implementation details
-- Focus on benefits, outcomes, and user value
-- Be concise — only include relevant sections
-{extended_scope}
-
-Write in a clear, business-focused style with proper markdown formatting.
-""").strip()
-
+        tech_prompt_template = TECH_PROMPT_CONCISE
+        business_prompt_template = BUSINESS_PROMPT_CONCISE
     else:
-        # Full prompts for larger commit sets
-        tech_prompt_template = textwrap.dedent(f"""
-You are a senior software developer writing a technical changelog for a development team.
-
-Analyze these commits and create a structured technical summary in {output_language}:
-
-{{base_context}}
-
-Create a structured technical summary. Start directly with content (no top-level ### header):
-
-[Write 1-2 sentence overview of the week's development activity]
-
-#### Main Changes by Category
-
-**Features:**
-- [List each new feature added as a bullet point]
-- [Be specific about what functionality was added]
-
-**Bug Fixes:**
-- [List each bug fix as a bullet point]
-- [Mention what issue was resolved]
-
-**Refactoring:**
-- [List code improvements and restructuring]
-- [Explain what was cleaned up or optimized]
-
-**Infrastructure/DevOps:**
-- [List build, deployment, and tooling changes]
-
-**Documentation:**
-- [List documentation updates]
-
-**Testing:**
-- [List test additions and improvements]
-
-#### Technical Highlights
-- [Key architectural decisions made]
-- [Performance improvements implemented]
-- [Security enhancements added]
-
-Requirements:
-- Start directly with the overview text (no ### header)
-- Use #### for sub-sections
-- Use bold text (**text:**) for category labels
-- Use bullet lists (-) for all items
-- Skip categories with no relevant changes
-- Provide specific details about what was changed and why
-{extended_focus}
-
-Write in a clear, structured format with proper markdown formatting.
-""").strip()
-
-        business_prompt_template = textwrap.dedent(f"""
-You are a product manager communicating updates to stakeholders and end users.
-
-Translate these technical commits into business impact in {output_language}:
-
-{{base_context}}
-
-Create a business-focused summary. Start directly with content (no top-level ### header):
-
-[Write 2-3 sentence overview for non-technical audience explaining what was accomplished this week]
-
-#### User Experience Impact
-- [How these changes affect what users see and experience]
-
-#### Business Benefits
-- [Value delivered to the organization]
-
-#### Performance & Reliability
-- [Improvements in system speed or responsiveness]
-
-#### New Capabilities
-- [New features or functionality now available]
-
-#### Important Changes to Note
-- [Breaking changes or significant updates users should be aware of]
-
-Requirements:
-- Start directly with the overview text (no ### header)
-- Use #### for sub-sections
-- Use bullet lists (-) for all items
-- Skip sections with no relevant changes
-- Avoid technical jargon and implementation details
-- Focus on benefits, outcomes, and user value
-{extended_scope}
-
-Write in a clear, business-focused style with proper markdown formatting.
-""").strip()
+        tech_prompt_template = TECH_PROMPT_FULL
+        business_prompt_template = BUSINESS_PROMPT_FULL
 
     @retry_api_call(max_retries=3, delay=2, timeout=30)
     def generate_summary(prompt, description, chunk_number=None):
@@ -961,6 +1452,7 @@ Write in a clear, business-focused style with proper markdown formatting.
         else:
             max_tokens = 3000
 
+        wait_for_rate_limit(rpm_limit)
         response = client.chat.completions.create(
             model=model,
             messages=[
@@ -972,10 +1464,6 @@ Write in a clear, business-focused style with proper markdown formatting.
             ],
             max_tokens=max_tokens,
             temperature=0.3,
-            extra_headers={
-                "HTTP-Referer": f"https://github.com/{os.getenv('GITHUB_REPOSITORY', 'unknown')}",
-                "X-Title": "Weekly-Changelog-Generator",
-            },
         )
 
         # Validate response
@@ -1000,9 +1488,29 @@ Write in a clear, business-focused style with proper markdown formatting.
         if not use_chunking:
             # No chunking needed, process all commits at once
             commits_text = "\n".join(commits_list)
+            cache_key = get_chunk_cache_key(
+                commits_text, summary_type, model, output_language, extended_analysis
+            )
+            cached_summary = read_chunk_cache(cache_key)
+            if cached_summary:
+                print(f"   💾 Cache hit for {description}")
+                return cached_summary
+
             base_context = f"Commits:\n{commits_text}{extended_context}"
-            prompt = prompt_template.format(base_context=base_context)
-            return generate_summary(prompt, description)
+            prompt = prompt_template.format(base_context=base_context, **prompt_fields)
+            summary = generate_summary(prompt, description)
+            if summary is not None:
+                write_chunk_cache(cache_key, summary)
+            return summary
+
+        # Tell the model the true commit count when the prompt set was capped
+        total_note = (
+            f" of {total_commits} total" if analyzed_commits < total_commits else ""
+        )
+
+        # Commits beyond the prompt cap are summarized as one extra chunk
+        # from their per-type overview
+        total_chunks = num_chunks + 1 if older_overview else num_chunks
 
         # Track cache statistics
         cache_hits = 0
@@ -1013,30 +1521,34 @@ Write in a clear, business-focused style with proper markdown formatting.
             """Process a single chunk and return (index, summary, cache_hit)"""
             nonlocal cache_hits, cache_misses
 
-            start_idx = chunk_idx * COMMITS_PER_CHUNK
-            end_idx = min(start_idx + COMMITS_PER_CHUNK, total_commits)
-            chunk_commits = commits_list[start_idx:end_idx]
-
-            commits_text = "\n".join(chunk_commits)
+            if chunk_idx < num_chunks:
+                start_idx = chunk_idx * COMMITS_PER_CHUNK
+                end_idx = min(start_idx + COMMITS_PER_CHUNK, analyzed_commits)
+                commits_text = "\n".join(commits_list[start_idx:end_idx])
+                commits_label = f"Commits (chunk {chunk_idx + 1} of {num_chunks}, commits {start_idx + 1}-{end_idx}{total_note})"
+            else:
+                start_idx, end_idx = analyzed_commits, total_commits
+                commits_text = older_overview
+                commits_label = f"Older commits {start_idx + 1}-{end_idx} of {total_commits} total, grouped by type with examples"
 
             # Check cache first
             cache_key = get_chunk_cache_key(
-                commits_text, summary_type, model, output_language
+                commits_text, summary_type, model, output_language, extended_analysis
             )
             cached_summary = read_chunk_cache(cache_key)
 
             if cached_summary:
                 print(
-                    f"   💾 Cache hit for chunk {chunk_idx + 1}/{num_chunks} {description}"
+                    f"   💾 Cache hit for chunk {chunk_idx + 1}/{total_chunks} {description}"
                 )
                 cache_hits += 1
                 return (chunk_idx, cached_summary, True)
 
             # Cache miss - generate new summary
             cache_misses += 1
-            base_context = f"Commits (chunk {chunk_idx + 1} of {num_chunks}, commits {start_idx + 1}-{end_idx}):\n{commits_text}{extended_context}"
+            base_context = f"{commits_label}:\n{commits_text}{extended_context}"
 
-            prompt = prompt_template.format(base_context=base_context)
+            prompt = prompt_template.format(base_context=base_context, **prompt_fields)
 
             try:
                 chunk_summary = generate_summary(
@@ -1045,11 +1557,13 @@ Write in a clear, business-focused style with proper markdown formatting.
                 # Write to cache
                 if chunk_summary is not None:
                     write_chunk_cache(cache_key, chunk_summary)
-                print(f"✅ Chunk {chunk_idx + 1}/{num_chunks} {description} completed")
+                print(
+                    f"✅ Chunk {chunk_idx + 1}/{total_chunks} {description} completed"
+                )
                 return (chunk_idx, chunk_summary, False)
             except Exception as e:
                 print(
-                    f"⚠️  Warning: Failed to generate {description} for chunk {chunk_idx + 1}: {e}"
+                    f"⚠️  Warning: Failed to generate {description} for chunk {chunk_idx + 1}: {redact_api_key(str(e), api_key)}"
                 )
                 # Continue with other chunks even if one fails
                 fallback = f"[Chunk {chunk_idx + 1} analysis failed - commits {start_idx + 1}-{end_idx} not included in detail]"
@@ -1063,7 +1577,7 @@ Write in a clear, business-focused style with proper markdown formatting.
             # Submit all chunks
             futures = [
                 executor.submit(process_chunk, chunk_idx)
-                for chunk_idx in range(num_chunks)
+                for chunk_idx in range(total_chunks)
             ]
 
             # Collect results maintaining order
@@ -1072,11 +1586,11 @@ Write in a clear, business-focused style with proper markdown formatting.
                 chunk_summaries_dict[chunk_idx] = chunk_summary
 
         # Convert dict to ordered list
-        chunk_summaries = [chunk_summaries_dict[i] for i in range(num_chunks)]
+        chunk_summaries = [chunk_summaries_dict[i] for i in range(total_chunks)]
 
         # Print cache statistics
         print(
-            f"   📊 Cache: {cache_hits} hits, {cache_misses} misses out of {num_chunks} chunks"
+            f"   📊 Cache: {cache_hits} hits, {cache_misses} misses out of {total_chunks} chunks"
         )
 
         # Merge all chunk summaries
@@ -1098,14 +1612,14 @@ Write in a clear, business-focused style with proper markdown formatting.
         # Submit both summary generation tasks
         tech_future = executor.submit(
             generate_chunked_summary,
-            commits_formatted,
+            prompt_commits,
             tech_prompt_template,
             "technical summary",
             "technical",
         )
         business_future = executor.submit(
             generate_chunked_summary,
-            commits_formatted,
+            prompt_commits,
             business_prompt_template,
             "business summary",
             "business",
@@ -1117,7 +1631,7 @@ Write in a clear, business-focused style with proper markdown formatting.
             print("✅ Technical summary generated successfully")
         except Exception as e:
             print(
-                f"⚠️  Using fallback for technical summary due to: {redact_api_key(str(e))}"
+                f"⚠️  Using fallback for technical summary due to: {redact_api_key(str(e), api_key)}"
             )
             tech_summary = config["fallback_tech"]
 
@@ -1126,69 +1640,14 @@ Write in a clear, business-focused style with proper markdown formatting.
             print("✅ Business summary generated successfully")
         except Exception as e:
             print(
-                f"⚠️  Using fallback for business summary due to: {redact_api_key(str(e))}"
+                f"⚠️  Using fallback for business summary due to: {redact_api_key(str(e), api_key)}"
             )
             business_summary = config["fallback_business"]
 
-    # Calculate week and year
-    today = datetime.date.today()
-    week_num = today.isocalendar()[1]
-    year = today.year
-
-    # Format date according to language
-    date_formats = {
-        "English": "%m-%d-%Y",
-        "Dutch": "%d-%m-%Y",
-        "German": "%d.%m.%Y",
-        "French": "%d/%m/%Y",
-        "Spanish": "%d/%m/%Y",
-    }
-    date_format = date_formats.get(output_language, "%m-%d-%Y")
-    formatted_date = today.strftime(date_format)
-
-    # Check for duplicate entries and handle force mode
-    changelog_path = "CHANGELOG.md"
-    week_header = f"## {config['week_label']} {week_num}, {year}"
-    force_suffix = f" {config['force_updated']}" if force_update else ""
+    # All API calls are done; release pooled connections
+    http_client.close()
 
     try:
-        if os.path.exists(changelog_path):
-            with open(changelog_path, encoding="utf-8") as f:
-                existing_content = f.read()
-
-            if week_header in existing_content and not force_update:
-                print(
-                    f"⚠️  Entry for {config['week_label']} {week_num}, {year} already exists. Use force=true to update anyway."
-                )
-                sys.exit(0)
-            elif week_header in existing_content and force_update:
-                print(
-                    f"🔧 Force mode: Updating existing entry for {config['week_label']} {week_num}, {year}"
-                )
-                # Remove existing entry
-                lines = existing_content.split("\n")
-                new_lines = []
-                skip_section = False
-
-                for line in lines:
-                    if line.startswith(week_header):
-                        skip_section = True
-                        continue
-                    elif line.startswith("## ") and skip_section:
-                        skip_section = False
-                        new_lines.append(line)
-                    elif line.startswith("---") and skip_section:
-                        skip_section = False
-                        continue
-                    elif not skip_section:
-                        new_lines.append(line)
-
-                existing_content = "\n".join(new_lines)
-        else:
-            existing_content = (
-                f"# {config['changelog_title']}\n\n{config['auto_updated']}\n"
-            )
-
         # Prepare statistics section for extended analysis
         stats_section = ""
         if extended_analysis:
@@ -1229,43 +1688,33 @@ Write in a clear, business-focused style with proper markdown formatting.
         )
         if stats_section:
             entry_parts.append(stats_section)
-        entry_parts.extend(
-            [
-                "",
-                f"### {config['all_commits']}",
-                commits_links_text,
-                "",
-                "---",
-            ]
-        )
+        entry_parts.extend(["", f"### {config['all_commits']}"])
         changelog_entry = "\n".join(entry_parts)
 
-        # Prepend new entry to the changelog (after header)
-        lines = existing_content.split("\n")
-        header_end = 0
-
-        # Find where to insert (after the main header and description)
-        for i, line in enumerate(lines):
-            if line.startswith("# ") or line.strip() == config["auto_updated"]:
-                header_end = i + 1
-            elif line.startswith("## ") or (
-                i > 0 and lines[i - 1].strip() == config["auto_updated"]
-            ):
-                break
-
-        # Insert the new entry
-        new_lines = lines[:header_end] + ["", changelog_entry, ""] + lines[header_end:]
-        new_content = "\n".join(new_lines)
-
-        # Write updated changelog
-        with open(changelog_path, "w", encoding="utf-8") as f:
-            f.write(new_content)
+        # Prepend new entry to the changelog (after header and description)
+        insert_at = find_entry_insert_offset(existing_content)
+        header = existing_content[:insert_at].rstrip("\n")
+
+        # Write header, new entry and remaining content straight into a temp
+        # file that atomically replaces the changelog. Commit links are the
+        # bulk of a large entry, so they are written one by one rather than
+        # joined into a single string first.
+        new_parts: Iterable[str] = itertools.chain(
+            [f"{header}\n\n" if header else "", changelog_entry],
+            (f"\n{link}" for link in commit_links),
+            ["\n\n---\n\n", existing_content[insert_at:]],
+        )
+        if tail_offset is not None:
+            new_parts = itertools.chain(
+                new_parts, iter_file_text(changelog_path, tail_offset)
+            )
+        write_text_atomic(changelog_path, new_parts)
 
         action = "updated (forced)" if force_update else "updated"
         print(f"✅ Changelog {action} for {config['week_label']} {week_num}, {year}")
 
     except Exception as e:
-        print(f"❌ Error writing changelog: {redact_api_key(str(e))}")
+        print(f"❌ Error writing changelog: {redact_api_key(str(e), api_key)}")
         print("💡 Common causes:")
         print("   - File permissions issue")
         print("   - Disk space issue")
@@ -29,6 +29,12 @@ class TestGetChunkCacheKey:
         key2 = get_chunk_cache_key("commits-b", "technical", "gpt-4", "English")
         assert key1 != key2
 
+    def test_extended_analysis_changes_key(self):
+        """Extended and basic prompts for the same commits are cached separately."""
+        key1 = get_chunk_cache_key("commits", "technical", "gpt-4", "English")
+        key2 = get_chunk_cache_key("commits", "technical", "gpt-4", "English", True)
+        assert key1 != key2
+
 
 class TestGetChunkCacheDir:
     """Tests for get_chunk_cache_dir function."""
@@ -36,12 +42,18 @@ class TestGetChunkCacheDir:
     def test_creates_directory(self, tmp_path):
         """Directory is created if it doesn't exist."""
         cache_dir = os.path.join(str(tmp_path), "changelog_cache", "chunks")
-        with patch("src.generate_changelog.tempfile") as mock_tempfile:
-            mock_tempfile.gettempdir.return_value = str(tmp_path)
-            result = get_chunk_cache_dir()
+        get_chunk_cache_dir.cache_clear()
+        try:
+            with patch("src.generate_changelog.tempfile") as mock_tempfile:
+                mock_tempfile.gettempdir.return_value = str(tmp_path)
+                result = get_chunk_cache_dir()
+                assert get_chunk_cache_dir() == result
+        finally:
+            get_chunk_cache_dir.cache_clear()
 
         assert result == cache_dir
         assert os.path.isdir(cache_dir)
+        mock_tempfile.gettempdir.assert_called_once()
 
 
 class TestReadChunkCache:
@@ -77,6 +89,32 @@ class TestReadChunkCache:
             result = read_chunk_cache("empty_key")
         assert result is None
 
+    def test_cache_disabled(self, tmp_path, monkeypatch):
+        """CACHE_DISABLE forces a miss even when the file exists."""
+        cache_file = tmp_path / "test_key.txt"
+        cache_file.write_text("cached content")
+        monkeypatch.setenv("CACHE_DISABLE", "1")
+
+        with patch(
+            "src.generate_changelog.get_chunk_cache_dir", return_value=str(tmp_path)
+        ):
+            result = read_chunk_cache("test_key")
+        assert result is None
+
+    def test_invalid_utf8_is_a_miss(self, tmp_path, capfd):
+        """Returns None and warns for a cache file that is not valid UTF-8."""
+        cache_file = tmp_path / "bad_utf8.txt"
+        cache_file.write_bytes(b"\xff\xfe summary")
+
+        with patch(
+            "src.generate_changelog.get_chunk_cache_dir", return_value=str(tmp_path)
+        ):
+            result = read_chunk_cache("bad_utf8")
+
+        assert result is None
+        captured = capfd.readouterr()
+        assert "Warning: Could not read cache file" in captured.out
+
     def test_handles_os_error(self, tmp_path, capfd):
         """Logs warning on read failure."""
         with patch(
@@ -104,13 +142,14 @@ class TestWriteChunkCache:
         cache_file = tmp_path / "write_key.txt"
         assert cache_file.exists()
         assert cache_file.read_text() == "some content"
+        assert os.listdir(tmp_path) == ["write_key.txt"]
 
     def test_handles_os_error(self, tmp_path, capfd):
         """Logs warning on write failure."""
         with patch(
             "src.generate_changelog.get_chunk_cache_dir", return_value=str(tmp_path)
         ):
-            with patch("builtins.open", side_effect=OSError("Disk full")):
+            with patch("os.fdopen", side_effect=OSError("Disk full")):
                 write_chunk_cache("bad_key", "content")
 
         captured = capfd.readouterr()
@@ -149,6 +188,24 @@ class TestCleanupChunkCache:
 
         assert recent_file.exists()
 
+    def test_ignores_directories_and_other_files(self, tmp_path):
+        """Only stale .txt files are removed."""
+        old_time = time.time() - (72 * 3600)
+        stale_dir = tmp_path / "dir.txt"
+        stale_dir.mkdir()
+        other_file = tmp_path / "notes.md"
+        other_file.write_text("keep")
+        for path in (stale_dir, other_file):
+            os.utime(path, (old_time, old_time))
+
+        with patch(
+            "src.generate_changelog.get_chunk_cache_dir", return_value=str(tmp_path)
+        ):
+            cleanup_chunk_cache(max_age_hours=48)
+
+        assert stale_dir.is_dir()
+        assert other_file.exists()
+
     def test_handles_missing_dir(self, tmp_path):
         """Handles non-existent directory gracefully."""
         missing = str(tmp_path / "nonexistent")
@@ -4,7 +4,15 @@ import os
 
 import pytest
 
-from src.generate_changelog import cleanup_temp_files, process_commits_in_chunks
+from src.generate_changelog import (
+    cleanup_temp_files,
+    find_entry_insert_offset,
+    has_changelog_section,
+    iter_commit_lines,
+    process_commits_in_chunks,
+    remove_changelog_section,
+    write_text_atomic,
+)
 
 
 class TestCleanupTempFiles:
@@ -86,7 +94,7 @@ class TestProcessCommitsInChunks:
         commits_raw = """abc123|feat: Add feature|Author1|2024-01-01|abc
 def456|fix: Fix bug|Author2|2024-01-02|def"""
 
-        formatted, links = process_commits_in_chunks(commits_raw, chunk_size=50)
+        formatted, links = process_commits_in_chunks(commits_raw)
 
         # Check formatted output
         assert len(formatted) == 2
@@ -106,7 +114,7 @@ def456|fix: Fix bug|Author2|2024-01-02|def"""
 
         commits_raw = ""
 
-        formatted, links = process_commits_in_chunks(commits_raw, chunk_size=50)
+        formatted, links = process_commits_in_chunks(commits_raw)
 
         # Should return empty lists for empty input
         assert len(formatted) == 0
@@ -119,23 +127,23 @@ def456|fix: Fix bug|Author2|2024-01-02|def"""
         # Line with pipe but fewer than 5 parts
         commits_raw = "abc123|partial line only"
 
-        formatted, links = process_commits_in_chunks(commits_raw, chunk_size=50)
+        formatted, links = process_commits_in_chunks(commits_raw)
 
         assert len(formatted) == 1
         assert formatted[0] == "• abc123|partial line only"
         assert links[0] == "- abc123|partial line only"
 
-    def test_process_commits_handles_multiple_chunks(self, monkeypatch, capfd):
-        """Test that process_commits_in_chunks processes large sets in chunks."""
+    def test_process_commits_handles_large_sets(self, monkeypatch, capfd):
+        """Test that process_commits_in_chunks processes large sets fully."""
         monkeypatch.setenv("GITHUB_REPOSITORY", "test-org/test-repo")
 
-        # Create 250 commits to trigger chunking logic
+        # Create 250 commits to trigger the progress summary
         commits = []
         for i in range(250):
             commits.append(f"hash{i}|feat: Feature {i}|Author{i}|2024-01-01|h{i}")
         commits_raw = "\n".join(commits)
 
-        formatted, links = process_commits_in_chunks(commits_raw, chunk_size=50)
+        formatted, links = process_commits_in_chunks(commits_raw)
 
         # Should process all commits
         assert len(formatted) == 250
@@ -147,6 +155,155 @@ def456|fix: Fix bug|Author2|2024-01-02|def"""
         assert "commits..." in captured.out
 
 
+class TestIterCommitLines:
+    """Tests for iter_commit_lines function."""
+
+    def test_streams_lines_without_newlines(self, tmp_path):
+        """Test that lines are yielded without trailing newlines or blanks."""
+        commits_file = tmp_path / "commits.txt"
+        commits_file.write_text(
+            "abc123|feat: Add feature|Author1|2024-01-01|abc\n"
+            "\n"
+            "def456|fix: Fix bug|Author2|2024-01-02|def\n"
+        )
+
+        lines = list(iter_commit_lines(str(commits_file)))
+
+        assert lines == [
+            "abc123|feat: Add feature|Author1|2024-01-01|abc",
+            "def456|fix: Fix bug|Author2|2024-01-02|def",
+        ]
+
+    def test_lines_feed_process_commits(self, tmp_path, monkeypatch):
+        """Test that streamed lines produce the same output as a raw string."""
+        monkeypatch.setenv("GITHUB_REPOSITORY", "test-org/test-repo")
+        commits_raw = "abc123|feat: Add feature|Author1|2024-01-01|abc\n"
+        commits_file = tmp_path / "commits.txt"
+        commits_file.write_text(commits_raw)
+
+        streamed = process_commits_in_chunks(iter_commit_lines(str(commits_file)))
+
+        assert streamed == process_commits_in_chunks(commits_raw)
+
+    def test_missing_file_raises(self, tmp_path):
+        """Test that a missing commits file raises FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            list(iter_commit_lines(str(tmp_path / "missing.txt")))
+
+
+class TestFindEntryInsertOffset:
+    """Tests for find_entry_insert_offset function."""
+
+    def test_offset_is_first_week_header(self):
+        """Test that new entries are inserted above the newest week."""
+        content = (
+            "# Changelog\n\nThis file is automatically updated.\n\n"
+            "## Week 5, 2024\n\nNewer\n\n---\n\n## Week 4, 2024\n\nOlder\n"
+        )
+
+        offset = find_entry_insert_offset(content)
+
+        assert content[offset:].startswith("## Week 5, 2024")
+
+    def test_subsection_headers_are_ignored(self):
+        """Test that ### headers and mid-line ## are not insertion points."""
+        content = "# Changelog\n\nUse ## for weeks.\n### Notes\n\n## Week 5, 2024\n"
+
+        offset = find_entry_insert_offset(content)
+
+        assert content[offset:] == "## Week 5, 2024\n"
+
+    def test_no_entries_appends_at_end(self):
+        """Test that a changelog without entries gets the entry appended."""
+        content = "# Changelog\n\nThis file is automatically updated.\n"
+
+        assert find_entry_insert_offset(content) == len(content)
+
+
+class TestHasChangelogSection:
+    """Tests for has_changelog_section function."""
+
+    def test_detects_entry_header(self):
+        """Test that an entry header, with or without suffix, is detected."""
+        content = "# Changelog\n\n## Week 5, 2024 (Force Updated)\n\nText\n"
+
+        assert has_changelog_section(content, "## Week 5, 2024")
+
+    def test_ignores_subheadings_and_quoted_headers(self):
+        """Test that ### headings, mid-line text and longer years don't match."""
+        content = "### Week 5, 2024\nSee ## Week 5, 2024 above.\n## Week 5, 20245\n"
+
+        assert not has_changelog_section(content, "## Week 5, 2024")
+
+
+class TestRemoveChangelogSection:
+    """Tests for remove_changelog_section function."""
+
+    def test_removes_entry_up_to_next_week(self):
+        """Test that the entry is removed and the next week is kept."""
+        content = (
+            "# Changelog\n\n## Week 5, 2024 (Force Updated)\n\nNewer\n\n"
+            "## Week 4, 2024\n\nOlder\n"
+        )
+
+        result = remove_changelog_section(content, "## Week 5, 2024")
+
+        assert result == "# Changelog\n\n## Week 4, 2024\n\nOlder\n"
+
+    def test_removes_trailing_separator(self):
+        """Test that a --- separator ends the entry and is removed with it."""
+        content = "# Changelog\n\n## Week 5, 2024\n\nNewer\n---\nFooter\n"
+
+        result = remove_changelog_section(content, "## Week 5, 2024")
+
+        assert result == "# Changelog\n\nFooter\n"
+
+    def test_similar_week_is_kept(self):
+        """Test that a header is matched literally and only at line start."""
+        content = "Notes on ## Week 5, 2024\n## Week 51, 2024\n\nKept\n"
+
+        assert remove_changelog_section(content, "## Week 5, 2024") == content
+
+
+class TestWriteTextAtomic:
+    """Tests for write_text_atomic function."""
+
+    def test_writes_parts_in_order(self, tmp_path):
+        """Test that all parts are written to the target file in order."""
+        target = tmp_path / "CHANGELOG.md"
+
+        write_text_atomic(str(target), ["# Changelog\n", "\n", "## Week 5, 2024\n"])
+
+        assert target.read_text() == "# Changelog\n\n## Week 5, 2024\n"
+        assert os.listdir(tmp_path) == ["CHANGELOG.md"]
+
+    def test_replaces_existing_file_and_keeps_mode(self, tmp_path):
+        """Test that an existing file is replaced and its permissions kept."""
+        target = tmp_path / "CHANGELOG.md"
+        target.write_text("old content")
+        target.chmod(0o664)
+
+        write_text_atomic(str(target), ["new content"])
+
+        assert target.read_text() == "new content"
+        assert target.stat().st_mode & 0o777 == 0o664
+
+    def test_failure_keeps_original_and_removes_temp_file(self, tmp_path):
+        """Test that a failed write leaves the original file untouched."""
+        target = tmp_path / "CHANGELOG.md"
+        target.write_text("original")
+
+        def failing_parts():
+            yield "partial"
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            write_text_atomic(str(target), failing_parts())
+
+        assert target.read_text() == "original"
+        assert os.listdir(tmp_path) == ["CHANGELOG.md"]
+
+
 class TestChangelogFormatLogic:
     """Tests for changelog format and logic patterns."""
 
@@ -305,16 +462,7 @@ class TestLanguageConfigChangelogKeys:
         """Test that date format is correct for each language."""
         import datetime
 
-        from src.generate_changelog import get_language_config
-
-        # Date formats used in the code
-        date_formats = {
-            "English": "%m-%d-%Y",
-            "Dutch": "%d-%m-%Y",
-            "German": "%d.%m.%Y",
-            "French": "%d/%m/%Y",
-            "Spanish": "%d/%m/%Y",
-        }
+        from src.generate_changelog import DATE_FORMATS, get_language_config
 
         test_date = datetime.date(2024, 1, 15)
 
@@ -326,7 +474,9 @@ class TestLanguageConfigChangelogKeys:
             "Spanish": "15/01/2024",
         }
 
-        for language, date_format in date_formats.items():
+        assert set(DATE_FORMATS) == set(expected_formats)
+
+        for language, date_format in DATE_FORMATS.items():
             formatted = test_date.strftime(date_format)
             assert formatted == expected_formats[language], (
                 f"Language '{language}' date format mismatch"
@@ -2,7 +2,11 @@
 
 import pytest
 
-from src.generate_changelog import process_commits_in_chunks
+from src.generate_changelog import (
+    iter_process_commits,
+    process_commits_in_chunks,
+    summarize_commits_by_type,
+)
 
 
 # Sample commit data helpers
@@ -93,6 +97,17 @@ class TestProcessCommitsInChunks:
         assert "feat: Add emoji 🎉 and symbols @#$" in commits_formatted[0]
         assert "Author" in commits_formatted[0]
 
+    def test_process_commit_with_pipe_in_subject(self):
+        """Test that a "|" inside the subject stays part of the subject."""
+        commits_raw = "abc123|feat: Support a|b syntax|Author|2024-01-01|abc"
+        commits_formatted, commit_links = process_commits_in_chunks(commits_raw)
+
+        assert commits_formatted == ["• feat: Support a|b syntax (Author, 2024-01-01)"]
+        assert commit_links == [
+            "- [abc](https://github.com/test-org/test-repo/commit/abc123) "
+            "feat: Support a|b syntax - Author"
+        ]
+
 
 class TestChunkingDecisionBoundary:
     """Test the chunking decision logic boundaries."""
@@ -135,3 +150,56 @@ class TestChunkingDecisionBoundary:
             import math
 
             assert expected_chunks == math.ceil(commit_count / COMMITS_PER_CHUNK)
+
+
+class TestIterProcessCommits:
+    """Test the generator behind process_commits_in_chunks."""
+
+    def test_matches_list_variant(self):
+        """Test that the generator yields the same pairs as the list variant."""
+        commits_raw = make_commits(12)
+
+        formatted, links = process_commits_in_chunks(commits_raw)
+
+        assert list(iter_process_commits(commits_raw)) == list(zip(formatted, links))
+
+    def test_is_lazy(self):
+        """Test that input lines are only consumed as pairs are requested."""
+        lines = iter(make_commits(3).split("\n"))
+
+        pairs = iter_process_commits(lines, "https://github.com/org/repo")
+        first = next(pairs)
+
+        assert first[0] == "• feat: Feature 0 (Author0, 2024-01-01)"
+        assert len(list(lines)) == 2
+
+
+class TestSummarizeCommitsByType:
+    """Test the per-type overview used for commits beyond the prompt cap."""
+
+    def test_groups_by_conventional_prefix(self):
+        """Test that scoped and breaking prefixes count toward their type."""
+        commits = [
+            "• feat(api): Add endpoint (A, 2024-01-01)",
+            "• fix: Fix crash (B, 2024-01-02)",
+            "• feat!: Drop old flag (C, 2024-01-03)",
+            "• Update README (D, 2024-01-04)",
+        ]
+
+        overview = summarize_commits_by_type(commits).split("\n")
+
+        assert overview[0] == (
+            "[feat] 2 commits, e.g.: feat(api): Add endpoint (A, 2024-01-01); "
+            "feat!: Drop old flag (C, 2024-01-03)"
+        )
+        assert overview[1] == "[fix] 1 commits, e.g.: fix: Fix crash (B, 2024-01-02)"
+        assert overview[2] == "[other] 1 commits, e.g.: Update README (D, 2024-01-04)"
+
+    def test_limits_examples_per_type(self):
+        """Test that only the first few commits of a type are quoted."""
+        commits, _ = process_commits_in_chunks(make_commits(50))
+
+        overview = summarize_commits_by_type(commits, examples=3)
+
+        assert overview.startswith("[feat] 50 commits, e.g.: feat: Feature 0 ")
+        assert overview.count("feat: Feature") == 3
@@ -71,6 +71,13 @@ class TestLanguageConfigurations:
                 )
                 assert value.strip(), f"Language '{language}' key '{key}' is empty"
 
+    def test_config_is_shared_between_calls(self):
+        """Test that lookups return the module-level config, not a rebuilt dict."""
+        from src.generate_changelog import LANGUAGE_CONFIGS
+
+        assert get_language_config("Dutch") is LANGUAGE_CONFIGS["Dutch"]
+        assert get_language_config("Dutch") is get_language_config("Dutch")
+
     def test_unsupported_language_fallback(self, capsys):
         """Test that unsupported language falls back to English with warning."""
         config = get_language_config("Klingon")
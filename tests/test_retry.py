@@ -1,20 +1,36 @@
 """Tests for retry decorator functionality."""
 
+from collections import deque
 from unittest.mock import patch
 
+import httpx
 import pytest
+from openai import APITimeoutError, AuthenticationError, RateLimitError
 
-from src.generate_changelog import retry_api_call
+from src.generate_changelog import (
+    classify_api_error,
+    classify_exception,
+    get_rpm_limit,
+    retry_api_call,
+    wait_for_rate_limit,
+)
 
 
-# Mock time.sleep to make tests instant
-@pytest.fixture(autouse=True)
-def mock_sleep():
-    """Mock time.sleep to make tests run instantly."""
+# Mock time.sleep once for the whole module to make tests instant
+@pytest.fixture(scope="module")
+def patched_sleep():
+    """Patch time.sleep for every test in this module."""
     with patch("time.sleep") as mock:
         yield mock
 
 
+@pytest.fixture(autouse=True)
+def mock_sleep(patched_sleep):
+    """Give each test a mocked time.sleep with no recorded calls."""
+    patched_sleep.reset_mock()
+    return patched_sleep
+
+
 def test_retry_success_first_attempt():
     """Test successful API call on first attempt."""
 
@@ -26,216 +42,206 @@ def test_retry_success_first_attempt():
     assert result == "success"
 
 
-def test_retry_rate_limit_429_then_success():
-    """Test retry on 429 rate limit error, then success."""
-    call_count = 0
-
-    @retry_api_call(max_retries=3, delay=1)
-    def rate_limited_call():
-        nonlocal call_count
-        call_count += 1
-        if call_count == 1:
-            raise Exception("Error 429: Too many requests - rate limit exceeded")
-        return "success after retry"
+def make_flaky_call(errors, result="success"):
+    """Build a callable that raises each error in turn, then returns result."""
+    calls = []
+    pending = iter(errors)
 
-    result = rate_limited_call()
-    assert result == "success after retry"
-    assert call_count == 2
-
-
-def test_retry_rate_limit_exhaustion():
-    """Test that rate limit exhaustion raises exception."""
-
-    @retry_api_call(max_retries=3, delay=1)
-    def always_rate_limited():
-        raise Exception("429 Rate limit exceeded")
+    def flaky_call():
+        calls.append(1)
+        error = next(pending, None)
+        if error is not None:
+            raise error
+        return result
 
-    with pytest.raises(Exception) as exc_info:
-        always_rate_limited()
+    return flaky_call, calls
 
-    assert "Rate limit exceeded" in str(exc_info.value)
 
+@pytest.mark.parametrize(
+    "messages,max_retries,expected_calls",
+    [
+        (["Error 429: Too many requests - rate limit exceeded"], 3, 2),
+        (["Connection timeout after 30 seconds"], 3, 2),
+        (["Some random API error"], 3, 2),
+        (["Network connection error", "Timeout waiting for response"], 5, 3),
+    ],
+    ids=["rate_limit", "timeout", "generic", "mixed_network"],
+)
+def test_retry_recovers_after_errors(messages, max_retries, expected_calls):
+    """Test that retryable errors are retried until the call succeeds."""
+    flaky_call, calls = make_flaky_call([Exception(m) for m in messages])
 
-def test_retry_auth_error_401_no_retry():
-    """Test that 401 auth errors fail immediately without retry."""
-    call_count = 0
+    result = retry_api_call(max_retries=max_retries, delay=1)(flaky_call)()
 
-    @retry_api_call(max_retries=3)
-    def auth_error():
-        nonlocal call_count
-        call_count += 1
-        raise Exception("401 Unauthorized: Invalid API key")
+    assert result == "success"
+    assert len(calls) == expected_calls
+
+
+@pytest.mark.parametrize(
+    "message,expected_calls,expected_error",
+    [
+        ("429 Rate limit exceeded", 3, "Rate limit exceeded"),
+        ("401 Unauthorized: Invalid API key", 1, "Authentication error"),
+        ("404 Model not found: openai/gpt-99-ultra", 1, "Model availability error"),
+        ("413 Request Entity Too Large", 1, "Payload too large error"),
+        ("Network connection failed", 3, "Network error"),
+        ("Some unknown server error", 3, "unknown server error"),
+    ],
+    ids=["rate_limit", "auth", "model", "payload", "network", "generic"],
+)
+def test_retry_failure_handling(message, expected_calls, expected_error):
+    """Test retry exhaustion, and that auth/model/payload errors fail fast."""
+    flaky_call, calls = make_flaky_call([Exception(message)] * 3)
 
     with pytest.raises(Exception) as exc_info:
-        auth_error()
+        retry_api_call(max_retries=3, delay=1)(flaky_call)()
 
-    # Should fail immediately without retrying
-    assert call_count == 1
-    assert "Authentication error" in str(exc_info.value)
+    assert len(calls) == expected_calls
+    assert expected_error in str(exc_info.value)
 
 
-def test_retry_model_not_found_404_no_retry():
-    """Test that 404 model not found errors fail immediately without retry."""
-    call_count = 0
+def test_retry_returns_none_when_all_succeed_without_return():
+    """Test that decorator returns None if function doesn't return anything."""
 
     @retry_api_call(max_retries=3)
-    def model_not_found():
-        nonlocal call_count
-        call_count += 1
-        raise Exception("404 Model not found: openai/gpt-99-ultra")
-
-    with pytest.raises(Exception) as exc_info:
-        model_not_found()
+    def void_function():
+        pass
 
-    # Should fail immediately without retrying
-    assert call_count == 1
-    assert "Model availability error" in str(exc_info.value)
+    result = void_function()
+    assert result is None
 
 
-def test_retry_payload_too_large_413():
-    """Test that 413 payload too large errors are handled correctly."""
-    call_count = 0
+def test_retry_generic_error_final_attempt_guidance(capsys):
+    """Test that final attempt failure prints guidance messages."""
 
-    @retry_api_call(max_retries=3)
-    def payload_too_large():
-        nonlocal call_count
-        call_count += 1
-        raise Exception("413 Request Entity Too Large")
+    @retry_api_call(max_retries=2, delay=1)
+    def always_fails():
+        raise Exception("Some persistent error")
 
     with pytest.raises(Exception) as exc_info:
-        payload_too_large()
+        always_fails()
 
-    # Should fail immediately without retrying (architectural error)
-    assert call_count == 1
-    assert "Payload too large error" in str(exc_info.value)
+    assert "persistent error" in str(exc_info.value)
+    captured = capsys.readouterr()
+    assert "Final attempt failed" in captured.out
+    assert "Reducing the days_back parameter" in captured.out
+    assert "Using a different model" in captured.out
+    assert "Checking OpenRouter service status" in captured.out
 
 
-def test_retry_timeout_then_success():
-    """Test retry on timeout error, then success."""
-    call_count = 0
+def test_retry_backoff_is_capped(mock_sleep):
+    """Test that retry waits are jittered but never exceed the cap."""
+    from src.generate_changelog import MAX_BACKOFF_SECONDS
 
-    @retry_api_call(max_retries=3, delay=1)
-    def timeout_then_success():
-        nonlocal call_count
-        call_count += 1
-        if call_count == 1:
-            raise Exception("Connection timeout after 30 seconds")
-        return "success after timeout"
+    @retry_api_call(max_retries=6, delay=20)
+    def always_rate_limited():
+        raise Exception("429 Rate limit exceeded")
 
-    result = timeout_then_success()
-    assert result == "success after timeout"
-    assert call_count == 2
+    with pytest.raises(Exception, match="Rate limit exceeded"):
+        always_rate_limited()
 
+    waits = [call.args[0] for call in mock_sleep.call_args_list]
+    assert len(waits) == 5
+    assert all(0 < wait <= MAX_BACKOFF_SECONDS for wait in waits)
 
-def test_retry_network_error_exhaustion():
-    """Test network error retry exhaustion."""
-    call_count = 0
 
-    @retry_api_call(max_retries=3, delay=1)
-    def always_network_error():
-        nonlocal call_count
-        call_count += 1
-        raise Exception("Network connection failed")
+def test_retry_uses_injected_sleeper(mock_sleep):
+    """Test that an injected sleeper replaces time.sleep between attempts."""
+    waits = []
+    flaky_call, _ = make_flaky_call([Exception("429 Rate limit")])
 
-    with pytest.raises(Exception) as exc_info:
-        always_network_error()
+    decorated = retry_api_call(max_retries=3, delay=1, sleeper=waits.append)(flaky_call)
 
-    # Should retry all attempts before failing
-    assert call_count == 3
-    assert "Network error" in str(exc_info.value)
+    assert decorated() == "success"
+    assert len(waits) == 1
+    mock_sleep.assert_not_called()
 
 
-def test_retry_generic_error_then_success():
-    """Test retry on generic error, then success."""
-    call_count = 0
+def test_classify_api_error():
+    """Test error classification, including priority when several classes match."""
+    assert classify_api_error("429 too many requests") == "rate"
+    assert classify_api_error("401 unauthorized") == "auth"
+    assert classify_api_error("model not found") == "model"
+    assert classify_api_error("413 request entity too large") == "payload"
+    assert classify_api_error("connection reset") == "network"
+    assert classify_api_error("timeout after 401 retry") == "auth"
+    assert classify_api_error("connection limited: rate limit") == "rate"
+    assert classify_api_error("something unexpected") is None
 
-    @retry_api_call(max_retries=3, delay=1)
-    def generic_error_then_success():
-        nonlocal call_count
-        call_count += 1
-        if call_count == 1:
-            raise Exception("Some random API error")
-        return "success after generic error"
 
-    result = generic_error_then_success()
-    assert result == "success after generic error"
-    assert call_count == 2
+def test_classify_exception_prefers_typed_errors():
+    """Test that openai's typed errors are classified without string matching."""
+    request = httpx.Request("POST", "https://openrouter.ai/api/v1/chat/completions")
 
+    def status_error(error_type, status_code):
+        response = httpx.Response(status_code, request=request)
+        return error_type("upstream said no", response=response, body=None)
 
-def test_retry_returns_none_when_all_succeed_without_return():
-    """Test that decorator returns None if function doesn't return anything."""
+    assert classify_exception(status_error(RateLimitError, 429)) == "rate"
+    assert classify_exception(status_error(AuthenticationError, 401)) == "auth"
+    assert classify_exception(APITimeoutError(request=request)) == "network"
+    assert classify_exception(Exception("404 model not found")) == "model"
 
-    @retry_api_call(max_retries=3)
-    def void_function():
-        pass
 
-    result = void_function()
-    assert result is None
+def test_retry_typed_timeout_then_success():
+    """Test that an APITimeoutError is retried as a network error."""
+    request = httpx.Request("POST", "https://openrouter.ai/api/v1/chat/completions")
+    flaky_call, calls = make_flaky_call([APITimeoutError(request=request)])
 
+    assert retry_api_call(max_retries=3, delay=1)(flaky_call)() == "success"
+    assert len(calls) == 2
 
-def test_retry_with_multiple_error_types():
-    """Test retry behavior with different error types in sequence."""
-    call_count = 0
 
-    @retry_api_call(max_retries=5, delay=1)
-    def mixed_errors():
-        nonlocal call_count
-        call_count += 1
-        if call_count == 1:
-            raise Exception("Network connection error")
-        elif call_count == 2:
-            raise Exception("Timeout waiting for response")
-        elif call_count == 3:
-            return "success after multiple retries"
+def test_retry_ignores_status_codes_inside_api_key(monkeypatch):
+    """Test that digits inside a leaked key don't trigger fail-fast handling."""
+    api_key = "sk-or-v1-abc404def5678"
+    monkeypatch.setenv("OPENROUTER_API_KEY", api_key)
+    flaky_call, calls = make_flaky_call([Exception(f"Upstream hiccup for {api_key}")])
 
-    result = mixed_errors()
-    assert result == "success after multiple retries"
-    assert call_count == 3
+    assert retry_api_call(max_retries=3, delay=1)(flaky_call)() == "success"
+    assert len(calls) == 2
 
 
-def test_retry_generic_error_exhaustion_returns_none():
-    """Test that exhausting all retries on generic errors returns None."""
-    call_count = 0
+def test_retry_preserves_function_name():
+    """Test that decorator preserves function name and docstring."""
 
-    @retry_api_call(max_retries=3, delay=1)
-    def always_generic_error():
-        nonlocal call_count
-        call_count += 1
-        raise Exception("Some unknown server error")
+    @retry_api_call(max_retries=3)
+    def my_function():
+        """This is my function."""
+        return "result"
 
-    with pytest.raises(Exception) as exc_info:
-        always_generic_error()
+    assert my_function.__name__ == "my_function"
+    assert my_function.__doc__ == "This is my function."
 
-    assert "unknown server error" in str(exc_info.value)
-    # Should have retried all attempts
-    assert call_count == 3
 
+def test_rpm_limit_defaults_by_model_tier(monkeypatch):
+    """Test that free models get the free-tier limit and others are unlimited."""
+    monkeypatch.delenv("OPENROUTER_RPM", raising=False)
+    assert get_rpm_limit("meta-llama/llama-3.3-70b-instruct:free") == 20
+    assert get_rpm_limit("openai/gpt-5-mini") == 0
 
-def test_retry_generic_error_final_attempt_guidance(capfd):
-    """Test that final attempt failure prints guidance messages."""
+    monkeypatch.setenv("OPENROUTER_RPM", "5")
+    assert get_rpm_limit("openai/gpt-5-mini") == 5
 
-    @retry_api_call(max_retries=2, delay=1)
-    def always_fails():
-        raise Exception("Some persistent error")
+    monkeypatch.setenv("OPENROUTER_RPM", "lots")
+    assert get_rpm_limit("openai/gpt-5-mini") == 0
 
-    with pytest.raises(Exception) as exc_info:
-        always_fails()
 
-    assert "persistent error" in str(exc_info.value)
-    captured = capfd.readouterr()
-    assert "Final attempt failed" in captured.out
-    assert "Reducing the days_back parameter" in captured.out
-    assert "Using a different model" in captured.out
-    assert "Checking OpenRouter service status" in captured.out
+def test_wait_for_rate_limit_blocks_when_window_full(mock_sleep):
+    """Test that a full window sleeps until the oldest request expires."""
+    clock = iter([100.0, 110.0, 120.0, 160.0])
+    with patch("src.generate_changelog._request_times", deque()):
+        with patch("time.monotonic", side_effect=lambda: next(clock)):
+            wait_for_rate_limit(2)
+            wait_for_rate_limit(2)
+            wait_for_rate_limit(2)
 
+    mock_sleep.assert_called_once_with(40.0)
 
-def test_retry_preserves_function_name():
-    """Test that decorator preserves function name and docstring."""
 
-    @retry_api_call(max_retries=3)
-    def my_function():
-        """This is my function."""
-        return "result"
+def test_wait_for_rate_limit_disabled(mock_sleep):
+    """Test that a limit of 0 never blocks."""
+    for _ in range(100):
+        wait_for_rate_limit(0)
 
-    assert my_function.__name__ == "my_function"
-    assert my_function.__doc__ == "This is my function."
+    mock_sleep.assert_not_called()